@@ -34,10 +34,14 @@ position = ((size - text_width) // 2, (size - text_height) // 2 - 10)
 draw.text(position, text, fill='white', font=font)
 
 # Save at different sizes
+# Chain downsamples (256 -> 64 -> 32 -> 16) so each LANCZOS pass starts from the previous size
 img.save('icon_256.png')
-img.resize((64, 64), Image.Resampling.LANCZOS).save('icon_64.png')
-img.resize((32, 32), Image.Resampling.LANCZOS).save('icon_32.png')
-img.resize((16, 16), Image.Resampling.LANCZOS).save('icon_16.png')
+img_64 = img.resize((64, 64), Image.Resampling.LANCZOS)
+img_64.save('icon_64.png')
+img_32 = img_64.resize((32, 32), Image.Resampling.LANCZOS)
+img_32.save('icon_32.png')
+img_16 = img_32.resize((16, 16), Image.Resampling.LANCZOS)
+img_16.save('icon_16.png')
 
 # Save as ICO (for Windows)
 img.save('icon.ico', format='ICO', sizes=[(256, 256), (64, 64), (32, 32), (16, 16)])
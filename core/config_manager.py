@@ -7,18 +7,27 @@ Handles loading, saving, and validation of configuration files with:
 - Version migration support
 """
 
-import json
+import hashlib
 import logging
+import os
+import pickle
 import shutil
+import sys
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from models.preferences import Preferences
 from models.server import MCPServer
 from models.profile import Profile
+from utils import json_io
+from utils.file_io import atomic_write_bytes
 from utils.constants import (
     CONFIG_DIR,
     CONFIG_FILE,
@@ -29,8 +38,77 @@ from utils.constants import (
     LOCK_FILE
 )
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+try:
+    import fastjsonschema
+except ImportError:  # Optional: validate_config falls back to manual checks
+    fastjsonschema = None
+
 logger = logging.getLogger(__name__)
 
+# Pickled templates: restoring via pickle.loads is much cheaper than deepcopy
+_TEMPLATE_BLOBS: Dict[str, bytes] = {
+    template_id: pickle.dumps(template, protocol=pickle.HIGHEST_PROTOCOL)
+    for template_id, template in MCP_SERVER_TEMPLATES.items()
+}
+_TEMPLATES_BLOB: bytes = pickle.dumps(MCP_SERVER_TEMPLATES, protocol=pickle.HIGHEST_PROTOCOL)
+# "servers" section of a fresh default config (template.to_dict() keeps each template's type)
+_DEFAULT_SERVERS_BLOB: bytes = pickle.dumps(
+    {server_id: server.to_dict() for server_id, server in MCP_SERVER_TEMPLATES.items()},
+    protocol=pickle.HIGHEST_PROTOCOL
+)
+
+
+@lru_cache(maxsize=2048)
+def _resolve_cached(path: str) -> Optional[str]:
+    """Resolve an absolute path once per process; resolution stats the filesystem."""
+    return _resolve_path(path)
+
+
+def _resolve_path(path: str) -> Optional[str]:
+    """Resolve ``path`` to a normalized string, falling back to the raw path."""
+    try:
+        return str(Path(path).resolve())
+    except Exception:
+        try:
+            return str(Path(path))
+        except Exception:
+            return None
+
+
+# Exponential backoff bounds (seconds) while waiting for the config lock
+LOCK_BACKOFF_INITIAL = 0.002
+LOCK_BACKOFF_MAX = 0.1
+
+# Structural schema mirrored by the manual checks in ConfigManager.validate_config
+_MAPPING = {"type": "object"}
+_CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ["version", "preferences", "servers", "profiles", "project_profiles"],
+    "properties": {
+        "version": {"type": "string"},
+        "preferences": _MAPPING,
+        "servers": {"type": "object", "additionalProperties": _MAPPING},
+        "profiles": {"type": "object", "additionalProperties": _MAPPING},
+        "project_profiles": {
+            "type": "object",
+            "additionalProperties": {"type": "object", "additionalProperties": _MAPPING}
+        }
+    }
+}
+_VALIDATE_CONFIG = fastjsonschema.compile(_CONFIG_SCHEMA) if fastjsonschema else None
+
+# Maximum threads used to remove legacy per-project profile files
+LEGACY_CLEANUP_WORKERS = 8
 
 class ConfigManager:
     """Manages application configuration with robust error handling."""
@@ -43,23 +121,54 @@ class ConfigManager:
         self.lock_file = LOCK_FILE
         self.project_profiles: Dict[str, Dict[str, Profile]] = {}
         self._legacy_cleanup_paths: Set[Path] = set()
+        # Digest + (mtime_ns, size) of the config file as last read or written
+        self._last_saved_hash: Optional[bytes] = None
+        self._last_saved_stat: Optional[Tuple[int, int]] = None
+
+        # Plain string paths for the hot save path (avoids Path object churn)
+        self._dir_str = os.fspath(self.config_dir)
+        self._cfg_str = os.fspath(self.config_file)
+        self._tmp_str = os.fspath(self.config_file.with_suffix('.tmp'))
+        self._bak_str = os.fspath(self.backup_file)
 
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        # The OS lock belongs to an open file description, not a thread, so
+        # threads sharing this manager are serialized in-process first
+        self._thread_lock = threading.Lock()
+        self._lock_fd: Optional[int] = None
+        # Run before every load/save so writers buffering edits (ProfileManager)
+        # put them on disk first; held weakly so owners are not kept alive
+        self._flush_hooks: List[weakref.WeakMethod] = []
 
         logger.info(f"ConfigManager initialized: {self.config_file}")
 
+    def add_flush_hook(self, hook: Callable[[], object]):
+        """
+        Register a bound method to run before every load() and save().
+
+        Args:
+            hook: Writes any edits its owner has not saved yet
+        """
+        self._flush_hooks.append(weakref.WeakMethod(hook))
+
+    def _run_flush_hooks(self):
+        """Let registered writers flush buffered edits before the file is read or replaced."""
+        for ref in list(self._flush_hooks):
+            hook = ref()
+            if hook is None:
+                self._flush_hooks.remove(ref)
+            else:
+                hook()
+
     @staticmethod
     def _normalize_path(path: Optional[str]) -> Optional[str]:
         """Normalize filesystem paths for consistent storage."""
         if not path:
             return None
-        try:
-            return str(Path(path).resolve())
-        except Exception:
-            try:
-                return str(Path(path))
-            except Exception:
-                return None
+        # Relative paths depend on the working directory, so only cache absolute ones
+        if os.path.isabs(path):
+            return _resolve_cached(path)
+        return _resolve_path(path)
 
     def normalize_project_path(self, path: Optional[str]) -> Optional[str]:
         """Public helper for normalizing project paths."""
@@ -69,35 +178,79 @@ class ConfigManager:
         """
         Acquire file lock for safe concurrent access.
 
+        Serializes threads of this process with an in-process lock, then takes
+        an OS-level advisory lock on the lock file (``flock`` on POSIX,
+        ``msvcrt.locking`` on Windows), retried with exponential backoff.
+
         Args:
             timeout: Maximum time to wait for lock in seconds
 
         Returns:
             True if lock acquired, False otherwise
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        if not self._thread_lock.acquire(timeout=max(timeout, 0)):
+            logger.error("Failed to acquire lock within timeout")
+            return False
+
+        try:
+            self._lock_fd = os.open(str(self.lock_file), os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            logger.error(f"Error opening lock file: {e}")
+            self._thread_lock.release()
+            return False
+
+        backoff = LOCK_BACKOFF_INITIAL
+        while True:
             try:
-                if not self.lock_file.exists():
-                    self.lock_file.touch()
-                    logger.debug("Lock acquired")
-                    return True
-                time.sleep(0.1)
+                self._lock_fd_exclusive()
+                logger.debug("Lock acquired")
+                return True
             except OSError as e:
-                logger.warning(f"Error acquiring lock: {e}")
-                time.sleep(0.1)
+                if not isinstance(e, (BlockingIOError, PermissionError)):
+                    logger.warning(f"Error acquiring lock: {e}")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(backoff, remaining))
+            backoff = min(backoff * 2, LOCK_BACKOFF_MAX)
 
         logger.error("Failed to acquire lock within timeout")
+        self._close_lock_fd()
         return False
 
     def _release_lock(self):
         """Release file lock."""
         try:
-            if self.lock_file.exists():
-                self.lock_file.unlink()
-                logger.debug("Lock released")
+            if fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(self._lock_fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._lock_fd, msvcrt.LK_UNLCK, 1)
+            logger.debug("Lock released")
         except OSError as e:
             logger.warning(f"Error releasing lock: {e}")
+        finally:
+            self._close_lock_fd()
+
+    def _close_lock_fd(self):
+        """Close the lock file descriptor and let the next thread in."""
+        try:
+            os.close(self._lock_fd)
+        except OSError as e:
+            logger.debug(f"Error closing lock file: {e}")
+        finally:
+            self._lock_fd = None
+            self._thread_lock.release()
+
+    def _lock_fd_exclusive(self):
+        """Take a non-blocking exclusive lock on the lock file descriptor."""
+        if fcntl is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            os.lseek(self._lock_fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._lock_fd, msvcrt.LK_NBLCK, 1)
 
     def _create_default_config(self) -> Dict:
         """
@@ -108,34 +261,24 @@ class ConfigManager:
         """
         logger.info("Creating default configuration with pre-loaded templates")
 
-        config = {
+        now = datetime.now()
+        return {
             "version": CONFIG_VERSION,
             "preferences": Preferences().to_dict(),
-            "servers": {
-                server_id: server.to_dict()
-                for server_id, server in MCP_SERVER_TEMPLATES.items()
-            },
+            "servers": pickle.loads(_DEFAULT_SERVERS_BLOB),
             "profiles": {
                 "default": Profile(
                     id="default",
                     name="Default Profile",
                     servers=list(MCP_SERVER_TEMPLATES.keys()),
-                    created=datetime.now(),
-                    modified=datetime.now(),
+                    created=now,
+                    modified=now,
                     description="Default profile with all pre-loaded servers"
                 ).to_dict()
             },
             "project_profiles": {}
         }
 
-        # Ensure HTTP templates keep type "http"
-        for server_id, server_data in config["servers"].items():
-            template = MCP_SERVER_TEMPLATES.get(server_id)
-            if template:
-                server_data["type"] = template.type
-
-        return config
-
     def load(self) -> Tuple[Preferences, Dict[str, MCPServer], Dict[str, Profile]]:
         """
         Load configuration from file with comprehensive error handling.
@@ -148,50 +291,67 @@ class ConfigManager:
         Returns:
             Tuple of (Preferences, servers_dict, profiles_dict)
         """
+        self._run_flush_hooks()
         if not self._acquire_lock():
             logger.error(ERROR_MESSAGES["CONFIG_LOCKED"])
             raise RuntimeError(ERROR_MESSAGES["CONFIG_LOCKED"])
 
         try:
+            # Set whenever the on-disk file must be (re)written once loading is done
+            needs_write = False
+
             if not self.config_file.exists():
                 logger.info(ERROR_MESSAGES["CONFIG_NOT_FOUND"])
                 config_data = self._create_default_config()
-                self._save_raw(config_data)
-                return self._parse_config(config_data)
-
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                logger.info("Configuration loaded successfully")
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Corrupted config file: {e}")
-
-                if self.backup_file.exists():
-                    logger.info("Attempting to restore from backup")
-                    try:
-                        with open(self.backup_file, 'r', encoding='utf-8') as f:
-                            config_data = json.load(f)
-                        logger.info(ERROR_MESSAGES["BACKUP_RESTORED"])
-                        config_data = self.migrate(config_data)
-                        self._save_raw(config_data)
-
-                    except json.JSONDecodeError:
-                        logger.error("Backup is also corrupted, creating default")
+                needs_write = True
+            else:
+                try:
+                    raw = self.config_file.read_bytes()
+                    config_data = json_io.loads(raw)
+                    self._remember_saved(self._hash_payload(raw))
+                    logger.info("Configuration loaded successfully")
+
+                except json_io.JSONDecodeError as e:
+                    logger.error(f"Corrupted config file: {e}")
+                    needs_write = True
+
+                    if self.backup_file.exists():
+                        logger.info("Attempting to restore from backup")
+                        try:
+                            config_data = json_io.loads(self.backup_file.read_bytes())
+                            logger.info(ERROR_MESSAGES["BACKUP_RESTORED"])
+
+                        except json_io.JSONDecodeError:
+                            logger.error("Backup is also corrupted, creating default")
+                            config_data = self._create_default_config()
+                    else:
+                        logger.warning("No backup found, creating default")
                         config_data = self._create_default_config()
-                        self._save_raw(config_data)
-                else:
-                    logger.warning("No backup found, creating default")
-                    config_data = self._create_default_config()
-                    self._save_raw(config_data)
 
+            loaded_version = config_data.get("version")
             config_data = self.migrate(config_data)
+            if needs_write or config_data.get("version") != loaded_version:
+                self._save_raw(config_data)
 
             return self._parse_config(config_data)
 
         finally:
             self._release_lock()
 
+    def safe_load(self) -> Optional[Tuple[Preferences, Dict[str, MCPServer], Dict[str, Profile]]]:
+        """
+        Load configuration, logging failures instead of raising.
+
+        Returns:
+            Tuple of (Preferences, servers_dict, profiles_dict), or None if
+            the configuration could not be loaded
+        """
+        try:
+            return self.load()
+        except Exception as e:
+            logger.error(f"Failed to load configuration: {e}")
+            return None
+
     def _parse_config(self, config_data: Dict) -> Tuple[Preferences, Dict[str, MCPServer], Dict[str, Profile]]:
         """
         Parse configuration dictionary into data models.
@@ -212,15 +372,7 @@ class ConfigManager:
                 if not isinstance(server_data, dict):
                     raise ValueError("Server entry is not a mapping")
 
-                server_data = dict(server_data)
-                server_data.setdefault("id", server_id)
-                server_data.setdefault("type", "stdio")
-
-                server = MCPServer.from_dict(server_data)
-
-                explicit_type = server_data.get("type")
-                if explicit_type:
-                    server.type = explicit_type
+                server = MCPServer.from_dict(server_data, default_id=server_id, default_type="stdio")
 
                 # Auto-correct servers that have URL but were incorrectly marked as stdio
                 if server.type == "stdio" and not server.command and server.url:
@@ -231,7 +383,8 @@ class ConfigManager:
                     server.command = None
                     server.args = None
 
-                servers[server_id] = server
+                # Interned ids make the profile membership checks below pointer compares
+                servers[sys.intern(server_id)] = server
             except Exception as e:
                 logger.error(f"Failed to parse server {server_id}: {e}")
 
@@ -246,7 +399,7 @@ class ConfigManager:
                 profile.scope = "global"
                 profile.project_path = None
                 if profile.servers:
-                    profile.servers = [sid for sid in profile.servers if sid in servers]
+                    profile.servers = [sys.intern(sid) for sid in profile.servers if sid in servers]
                 profiles[profile_id] = profile
             except Exception as e:
                 logger.error(f"Failed to parse profile {profile_id}: {e}")
@@ -288,9 +441,13 @@ class ConfigManager:
 
         # Ensure default templates are present even if missing from config
         restored_templates: List[str] = []
-        for template_id, template in MCP_SERVER_TEMPLATES.items():
-            if template_id not in servers:
-                template_copy = deepcopy(template)
+        missing = MCP_SERVER_TEMPLATES.keys() - servers.keys()
+        if missing:
+            # Walk templates in declaration order so restored servers stay deterministic
+            for template_id in MCP_SERVER_TEMPLATES:
+                if template_id not in missing:
+                    continue
+                template_copy = pickle.loads(_TEMPLATE_BLOBS[template_id])
                 template_copy.enabled = False
                 template_copy.is_template = True
                 servers[template_id] = template_copy
@@ -307,21 +464,26 @@ class ConfigManager:
 
     def _sanitize_preferences(self, prefs: Preferences) -> Preferences:
         """Normalize preference paths for consistency."""
-        normalized_last = self._normalize_path(prefs.last_path) if prefs.last_path else None
-        prefs.last_path = normalized_last or ""
-
-        sanitized_recent: List[str] = []
-        seen = set()
-        for raw_path in prefs.recent_projects or []:
-            normalized = self._normalize_path(raw_path)
-            if normalized and normalized not in seen:
-                sanitized_recent.append(normalized)
-                seen.add(normalized)
-        prefs.recent_projects = sanitized_recent
+        norm = self._normalize_path
+        # recent_projects and project_last_profiles keys overlap heavily
+        normalized_cache: Dict[str, Optional[str]] = {}
+
+        def normalize(raw_path: str) -> Optional[str]:
+            if raw_path not in normalized_cache:
+                normalized_cache[raw_path] = norm(raw_path)
+            return normalized_cache[raw_path]
+
+        prefs.last_path = (normalize(prefs.last_path) if prefs.last_path else None) or ""
+
+        prefs.recent_projects = list(dict.fromkeys(
+            normalized
+            for normalized in map(normalize, prefs.recent_projects or [])
+            if normalized
+        ))
 
         sanitized_map: Dict[str, str] = {}
         for raw_path, profile_id in (prefs.project_last_profiles or {}).items():
-            normalized = self._normalize_path(raw_path)
+            normalized = normalize(raw_path)
             if normalized:
                 sanitized_map[normalized] = profile_id
         prefs.project_last_profiles = sanitized_map
@@ -335,8 +497,94 @@ class ConfigManager:
         Args:
             config_data: Configuration dictionary to save
         """
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=2, default=str)
+        self._write_atomic(json_io.dumps(config_data, indent=True))
+
+    def _write_atomic(self, payload: bytes):
+        """
+        Durably replace the config file with ``payload``.
+
+        Writes to a temp file, fsyncs it, renames it over the config file and
+        then fsyncs the parent directory so the rename itself survives a crash.
+
+        Args:
+            payload: Serialized configuration bytes
+        """
+        atomic_write_bytes(self._cfg_str, payload, self._tmp_str)
+        self._fsync_config_dir()
+        self._remember_saved(self._hash_payload(payload))
+
+    @staticmethod
+    def _hash_payload(payload: bytes) -> bytes:
+        """Return a short content digest of serialized config bytes."""
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _config_stat(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the config file, or None if missing."""
+        try:
+            st = os.stat(self._cfg_str)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _remember_saved(self, digest: bytes):
+        """Record the digest and stat of the config file currently on disk."""
+        self._last_saved_hash = digest
+        self._last_saved_stat = self._config_stat()
+
+    def _is_unchanged_on_disk(self, digest: bytes) -> bool:
+        """True if the config file on disk already holds content with ``digest``."""
+        if digest != self._last_saved_hash or self._last_saved_stat is None:
+            return False
+        # Guard against edits made by another process since we last touched it
+        return self._config_stat() == self._last_saved_stat
+
+    def _create_backup(self, hardlink: bool):
+        """
+        Snapshot the current config file to the backup path.
+
+        With ``hardlink`` the backup becomes a second link to the current inode,
+        which costs no data I/O. Only use it right before the config is replaced
+        via rename: the backup then keeps the old inode on its own. Falls back
+        to a byte copy where hard links are unsupported (FAT, some network
+        shares, cross-device).
+
+        Args:
+            hardlink: Link instead of copying when the platform allows it
+        """
+        if not os.path.exists(self._cfg_str):
+            return
+
+        if hardlink:
+            try:
+                os.unlink(self._bak_str)
+            except FileNotFoundError:
+                pass
+            try:
+                os.link(self._cfg_str, self._bak_str)
+                logger.debug("Backup created (hard link)")
+                return
+            except (OSError, AttributeError) as e:
+                logger.debug(f"Hard link backup unavailable, copying instead: {e}")
+
+        shutil.copyfile(self._cfg_str, self._bak_str)
+        logger.debug("Backup created")
+
+    def _fsync_config_dir(self):
+        """Flush directory metadata (the rename) to disk where supported."""
+        # Windows cannot open directories as file descriptors
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        try:
+            dir_fd = os.open(self._dir_str, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError as e:
+            logger.debug(f"Could not open config directory for fsync: {e}")
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError as e:
+            logger.debug(f"Config directory fsync failed: {e}")
+        finally:
+            os.close(dir_fd)
 
     def save(
         self,
@@ -356,14 +604,24 @@ class ConfigManager:
             profiles: Dictionary of profiles
             project_profiles: Optional project-specific profiles
         """
+        self._run_flush_hooks()
         if not self._acquire_lock():
             raise RuntimeError(ERROR_MESSAGES["CONFIG_LOCKED"])
 
         try:
-            if self.config_file.exists():
-                shutil.copy2(self.config_file, self.backup_file)
-                logger.debug("Backup created")
+            self._save_locked(preferences, servers, profiles, project_profiles)
+        finally:
+            self._release_lock()
 
+    def _save_locked(
+        self,
+        preferences: Preferences,
+        servers: Dict[str, MCPServer],
+        profiles: Dict[str, Profile],
+        project_profiles: Optional[Dict[str, Dict[str, Profile]]]
+    ):
+        """Serialize and write the configuration; the caller holds the lock."""
+        try:
             if project_profiles is not None:
                 normalized_map: Dict[str, Dict[str, Profile]] = {}
                 for raw_path, profile_map in project_profiles.items():
@@ -387,21 +645,20 @@ class ConfigManager:
                 "project_profiles": self._serialize_project_profiles(self.project_profiles)
             }
 
-            temp_file = self.config_file.with_suffix('.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, default=str)
-
-            temp_file.replace(self.config_file)
-            logger.info("Configuration saved successfully")
+            payload = json_io.dumps(config_data, indent=True)
+            if self._is_unchanged_on_disk(self._hash_payload(payload)):
+                # Nothing is replaced, so the backup keeps the previous version
+                logger.debug("Configuration unchanged, skipping write")
+            else:
+                self._create_backup(hardlink=True)
+                self._write_atomic(payload)
+                logger.info("Configuration saved successfully")
             self._cleanup_legacy_files()
 
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}")
             raise
 
-        finally:
-            self._release_lock()
-
     def save_with_rollback(
         self,
         preferences: Preferences,
@@ -422,24 +679,69 @@ class ConfigManager:
         Returns:
             True if save succeeded, False if rolled back
         """
-        # Create snapshot before save
-        snapshot = None
-        if self.config_file.exists():
-            snapshot = self.config_file.read_bytes()
+        self._run_flush_hooks()
+        if not self._acquire_lock():
+            logger.error(ERROR_MESSAGES["CONFIG_LOCKED"])
+            return False
 
         try:
-            self.save(preferences, servers, profiles, project_profiles=project_profiles)
-            return True
+            # Taken under the lock so no other save lands between snapshot and write
+            try:
+                snapshot = self._take_snapshot()
+            except OSError as e:
+                logger.error(f"Could not snapshot configuration, not saving: {e}")
+                return False
 
-        except Exception as e:
-            logger.error(f"Save failed, rolling back: {e}")
+            try:
+                self._save_locked(preferences, servers, profiles, project_profiles)
+            except Exception as e:
+                logger.error(f"Save failed, rolling back: {e}")
+                if snapshot:
+                    self._restore_snapshot(snapshot)
+                return False
 
-            # Restore snapshot
             if snapshot:
-                self.config_file.write_bytes(snapshot)
-                logger.info("Configuration rolled back successfully")
+                try:
+                    os.unlink(snapshot)
+                except OSError as e:
+                    logger.debug(f"Could not remove config snapshot: {e}")
+            return True
 
-            return False
+        finally:
+            self._release_lock()
+
+    def _take_snapshot(self) -> Optional[str]:
+        """
+        Snapshot the current config file as a hard link (no bytes copied).
+
+        Returns:
+            Snapshot path, or None if there is no config file yet
+        """
+        snapshot = self._cfg_str + '.snapshot'
+        try:
+            os.unlink(snapshot)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(self._cfg_str, snapshot)
+        except FileNotFoundError:
+            return None
+        except (OSError, AttributeError):
+            # Hard links unsupported here: fall back to a single copy
+            shutil.copyfile(self._cfg_str, snapshot)
+        return snapshot
+
+    def _restore_snapshot(self, snapshot: str):
+        """Put a snapshot back in place of the config file, logging failures."""
+        try:
+            if os.path.exists(self._cfg_str) and os.path.samefile(snapshot, self._cfg_str):
+                # Config was never replaced; rename() onto the same inode is a no-op
+                os.unlink(snapshot)
+            else:
+                os.replace(snapshot, self._cfg_str)
+            logger.info("Configuration rolled back successfully")
+        except OSError as e:
+            logger.error(f"Rollback failed, snapshot kept at {snapshot}: {e}")
 
     def load_presets(self) -> Dict[str, MCPServer]:
         """
@@ -449,8 +751,8 @@ class ConfigManager:
             Dictionary of pre-loaded MCP server templates (deep copy)
         """
         logger.info(f"Loading {len(MCP_SERVER_TEMPLATES)} pre-loaded templates")
-        # Deep copy to prevent mutations affecting the template
-        return deepcopy(MCP_SERVER_TEMPLATES)
+        # Fresh copy from the pickled snapshot to prevent mutations affecting the template
+        return pickle.loads(_TEMPLATES_BLOB)
 
     def migrate(self, config_data: Dict) -> Dict:
         """
@@ -464,8 +766,10 @@ class ConfigManager:
         """
         current_version = config_data.get("version", "1.0.0")
 
-        if "project_profiles" not in config_data:
-            config_data["project_profiles"] = {}
+        if current_version == CONFIG_VERSION and "project_profiles" in config_data:
+            return config_data
+
+        config_data.setdefault("project_profiles", {})
 
         if current_version == CONFIG_VERSION:
             return config_data
@@ -489,6 +793,14 @@ class ConfigManager:
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
+        if _VALIDATE_CONFIG is not None:
+            try:
+                _VALIDATE_CONFIG(config_data)
+                return True, []
+            except fastjsonschema.JsonSchemaException:
+                # Fall through to collect every error, not just the first
+                pass
+
         errors = []
 
         # Check required keys
@@ -571,17 +883,37 @@ class ConfigManager:
 
     def _cleanup_legacy_files(self):
         """Remove legacy per-project profile files once data is centralized."""
-        for legacy_path in list(self._legacy_cleanup_paths):
-            try:
-                if legacy_path.exists():
-                    legacy_path.unlink()
-                    parent = legacy_path.parent
-                    if parent.exists() and not any(parent.iterdir()):
-                        parent.rmdir()
-            except Exception as exc:
-                logger.warning(f"Failed to clean up legacy project profiles file {legacy_path}: {exc}")
-            finally:
-                self._legacy_cleanup_paths.discard(legacy_path)
+        legacy_paths = list(self._legacy_cleanup_paths)
+        if not legacy_paths:
+            return
+
+        if len(legacy_paths) == 1:
+            self._remove_legacy_file(legacy_paths[0])
+        else:
+            # Overlap the unlink/rmdir syscall latency across projects
+            workers = min(LEGACY_CLEANUP_WORKERS, len(legacy_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self._remove_legacy_file, legacy_paths))
+
+        self._legacy_cleanup_paths.difference_update(legacy_paths)
+
+    @staticmethod
+    def _remove_legacy_file(legacy_path: Path):
+        """Delete one legacy profiles file and its directory if left empty."""
+        try:
+            legacy_path.unlink()
+        except FileNotFoundError:
+            return
+        except Exception as exc:
+            logger.warning(f"Failed to clean up legacy project profiles file {legacy_path}: {exc}")
+            return
+
+        parent = legacy_path.parent
+        try:
+            parent.rmdir()
+        except OSError:
+            # Directory not empty (or already gone) - leave it alone
+            pass
 
     def _promote_project_profile(
         self,
@@ -593,7 +925,7 @@ class ConfigManager:
         profile.scope = "global"
         profile.project_path = None
         if profile.servers:
-            profile.servers = [sid for sid in profile.servers if sid in servers]
+            profile.servers = [sys.intern(sid) for sid in profile.servers if sid in servers]
 
         base_id = profile.id or "profile"
         unique_id = base_id
@@ -619,9 +951,8 @@ class ConfigManager:
             return 0
 
         try:
-            with open(profiles_file, 'r', encoding='utf-8') as handle:
-                data = json.load(handle) or {}
-        except (json.JSONDecodeError, OSError) as exc:
+            data = json_io.loads(profiles_file.read_bytes()) or {}
+        except (json_io.JSONDecodeError, OSError) as exc:
             logger.error("Failed to read legacy project profiles from %s: %s", profiles_file, exc)
             return 0
 
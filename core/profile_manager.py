@@ -5,16 +5,52 @@ Handles create, update, delete, get, list, and switch operations for profiles.
 Integrates with ConfigManager for persistence.
 """
 
+import atexit
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from copy import deepcopy
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from models.profile import Profile
 from models.server import MCPServer
 from core.config_manager import ConfigManager
+from models.preferences import Preferences
 
 logger = logging.getLogger(__name__)
 
+# Profile edits made within this window are written to disk in one save
+SAVE_DEBOUNCE_SECONDS = 0.2
+
+# Sentinel for dict.pop lookups that may miss
+_MISSING = object()
+
+# One pending edit, replayable onto a (preferences, servers, profiles) state
+_Edit = Callable[[Preferences, Dict[str, MCPServer], Dict[str, Profile]], None]
+
+# Managers whose pending edits are written at exit (weak: not kept alive)
+_live_managers: "weakref.WeakSet[ProfileManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_managers():
+    """Write pending edits of every ProfileManager still alive at exit."""
+    for manager in list(_live_managers):
+        manager.flush()
+
+
+def _put_profile(profile_id: str, profile: Profile) -> _Edit:
+    """Return an edit that adds or replaces a profile with a snapshot of ``profile``."""
+    snapshot = deepcopy(profile)
+
+    def edit(preferences: Preferences, servers: Dict[str, MCPServer], profiles: Dict[str, Profile]):
+        profiles[profile_id] = deepcopy(snapshot)
+
+    return edit
+
 
 class ProfileManager:
     """Manages profile operations with persistence."""
@@ -22,6 +58,161 @@ class ProfileManager:
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
         self.current_project_path: Optional[str] = None
+        self._cache: Optional[Tuple[Preferences, Dict[str, MCPServer], Dict[str, Profile]]] = None
+        self._cache_key: Optional[Tuple[int, int, int]] = None
+        self._enabled_ids: Optional[List[str]] = None
+        # Edits not on disk yet, in order; replayed if the file changes under us
+        self._pending_edits: List[_Edit] = []
+        self._save_error: Optional[str] = None
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.RLock()
+        # Thread currently loading/saving on this manager's behalf; the flush
+        # hook must not re-enter for our own config access
+        self._accessing_thread: Optional[int] = None
+        _live_managers.add(self)
+        config_manager.add_flush_hook(self._flush_before_access)
+
+    @contextmanager
+    def _own_config_access(self):
+        """Mark config loads/saves made by this manager so its flush hook skips them."""
+        previous = self._accessing_thread
+        self._accessing_thread = threading.get_ident()
+        try:
+            yield
+        finally:
+            self._accessing_thread = previous
+
+    def _flush_before_access(self):
+        """ConfigManager hook: write pending edits before anyone else loads or saves."""
+        if self._pending_edits and self._accessing_thread != threading.get_ident():
+            self.flush()
+
+    def _config_key(self) -> Optional[Tuple[int, int, int]]:
+        """Return (mtime_ns, size, inode) of the config file, or None if missing.
+
+        The inode is part of the key because saves replace the file via rename,
+        so two writes within one timestamp tick still produce distinct keys.
+        """
+        try:
+            st = os.stat(self.config_manager.config_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load_cached(
+        self,
+        mutable: bool = False
+    ) -> Optional[Tuple[Preferences, Dict[str, MCPServer], Dict[str, Profile]]]:
+        """
+        Return (preferences, servers, profiles), reusing the last parse if the
+        config file has not changed on disk since.
+
+        Args:
+            mutable: Return a private copy of the whole state the caller may
+                     modify. Otherwise the cached objects themselves are
+                     returned and must not be handed out or changed.
+
+        Returns:
+            The config tuple, or None if it could not be loaded (already logged)
+        """
+        with self._flush_lock:
+            key = self._config_key()
+            if self._cache is None or key is None or key != self._cache_key:
+                if not self._reload():
+                    return None
+
+            return deepcopy(self._cache) if mutable else self._cache
+
+    def _reload(self) -> bool:
+        """Re-read the config file, replaying edits that are not on disk yet."""
+        with self._own_config_access():
+            state = self.config_manager.safe_load()
+        if state is None:
+            return False
+        if self._pending_edits:
+            # Saved elsewhere since our last write: keep those changes and
+            # apply ours on top rather than dropping either
+            logger.debug("Config changed on disk, reapplying %s pending profile edits",
+                         len(self._pending_edits))
+            for edit in self._pending_edits:
+                edit(*state)
+        self._cache = state
+        # load() may have rewritten the file (migration, restore), so restat
+        self._cache_key = self._config_key()
+        self._enabled_ids = None
+        return True
+
+    def _store_cache(
+        self,
+        preferences: Preferences,
+        servers: Dict[str, MCPServer],
+        profiles: Dict[str, Profile],
+        edit: _Edit
+    ):
+        """
+        Make the edited config the cache and schedule it to be saved.
+
+        Args:
+            edit: Replays the same change onto a freshly loaded state, used if
+                  the file is saved elsewhere before this edit is written
+        """
+        with self._flush_lock:
+            self._cache = (preferences, servers, profiles)
+            self._enabled_ids = None
+            self._pending_edits.append(edit)
+            self._schedule_save()
+
+    def _schedule_save(self):
+        """(Re)start the debounced save timer."""
+        with self._flush_lock:
+            self._cancel_timer()
+            self._flush_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, self._do_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _cancel_timer(self):
+        """Stop a scheduled save; pending edits are kept."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _do_flush(self) -> Tuple[bool, Optional[str]]:
+        """Write pending edits to disk, merged onto the file if it changed meanwhile."""
+        with self._flush_lock:
+            self._cancel_timer()
+            if not self._pending_edits:
+                return True, None
+
+            try:
+                if self._config_key() != self._cache_key and not self._reload():
+                    raise RuntimeError("configuration could not be loaded")
+                with self._own_config_access():
+                    self.config_manager.save(*self._cache)
+            except Exception as e:
+                # Keep the edits: the next flush (or profile operation) retries
+                self._save_error = f"Failed to save profiles: {e}"
+                logger.error(self._save_error)
+                return False, self._save_error
+
+            self._cache_key = self._config_key()
+            self._pending_edits.clear()
+            self._save_error = None
+            return True, None
+
+    def flush(self) -> Tuple[bool, Optional[str]]:
+        """
+        Write any pending profile edits to disk immediately.
+
+        Returns:
+            Tuple of (success, error_message)
+        """
+        return self._do_flush()
+
+    def _retry_failed_save(self) -> Optional[str]:
+        """Retry a save that failed in the background; return the error if it still fails."""
+        if self._save_error is None:
+            return None
+        return self.flush()[1]
 
     def _normalize_project_path(self, project_path: Optional[str]) -> Optional[str]:
         return self.config_manager.normalize_project_path(project_path)
@@ -46,14 +237,21 @@ class ProfileManager:
             Tuple of (success, error_message, profile)
         """
         try:
-            preferences, servers, profiles = self.config_manager.load()
+            error = self._retry_failed_save()
+            if error:
+                return False, error, None
+            state = self._load_cached(mutable=True)
+            if state is None:
+                return False, "Failed to load configuration", None
+            preferences, servers, profiles = state
 
             if profile_id in profiles:
                 return False, f"Profile '{profile_id}' already exists", None
 
-            for server_id in server_ids:
-                if server_id not in servers:
-                    return False, f"Server '{server_id}' does not exist", None
+            server_ids = list(dict.fromkeys(server_ids))
+            missing = set(server_ids).difference(servers)
+            if missing:
+                return False, f"Server '{next(iter(missing))}' does not exist", None
 
             now = datetime.now()
             profile = Profile(
@@ -68,10 +266,10 @@ class ProfileManager:
 
             profiles[profile_id] = profile
 
-            self.config_manager.save(preferences, servers, profiles)
+            self._store_cache(preferences, servers, profiles, _put_profile(profile_id, profile))
 
-            logger.info(f"Profile created: {profile_id} with {len(server_ids)} servers")
-            return True, None, profile
+            logger.info("Profile created: %s with %s servers", profile_id, len(server_ids))
+            return True, None, deepcopy(profile)
 
         except Exception as e:
             error_msg = f"Failed to create profile: {e}"
@@ -98,16 +296,23 @@ class ProfileManager:
             Tuple of (success, error_message, profile)
         """
         try:
-            preferences, servers, profiles = self.config_manager.load()
+            error = self._retry_failed_save()
+            if error:
+                return False, error, None
+            state = self._load_cached(mutable=True)
+            if state is None:
+                return False, "Failed to load configuration", None
+            preferences, servers, profiles = state
 
             target_profile = profiles.get(profile_id)
             if target_profile is None:
                 return False, f"Profile '{profile_id}' not found", None
 
             if server_ids is not None:
-                for server_id in server_ids:
-                    if server_id not in servers:
-                        return False, f"Server '{server_id}' does not exist", None
+                server_ids = list(dict.fromkeys(server_ids))
+                missing = set(server_ids).difference(servers)
+                if missing:
+                    return False, f"Server '{next(iter(missing))}' does not exist", None
 
             if name is not None:
                 target_profile.name = name
@@ -120,11 +325,10 @@ class ProfileManager:
             target_profile.scope = "global"
             target_profile.project_path = None
 
-            profiles[profile_id] = target_profile
-            self.config_manager.save(preferences, servers, profiles)
-            logger.info(f"Profile updated: {profile_id}")
+            self._store_cache(preferences, servers, profiles, _put_profile(profile_id, target_profile))
+            logger.info("Profile updated: %s", profile_id)
 
-            return True, None, target_profile
+            return True, None, deepcopy(target_profile)
 
         except Exception as e:
             error_msg = f"Failed to update profile: {e}"
@@ -142,19 +346,27 @@ class ProfileManager:
             Tuple of (success, error_message)
         """
         try:
-            preferences, servers, profiles = self.config_manager.load()
-
-            if profile_id not in profiles:
+            error = self._retry_failed_save()
+            if error:
+                return False, error
+            state = self._load_cached(mutable=True)
+            if state is None:
+                return False, "Failed to load configuration"
+            preferences, servers, profiles = state
+
+            if profiles.pop(profile_id, _MISSING) is _MISSING:
                 return False, f"Profile '{profile_id}' not found"
-
-            del profiles[profile_id]
-
             if preferences.last_profile == profile_id:
                 preferences.last_profile = "default"
 
-            self.config_manager.save(preferences, servers, profiles)
+            def edit(preferences: Preferences, servers: Dict[str, MCPServer], profiles: Dict[str, Profile]):
+                profiles.pop(profile_id, None)
+                if preferences.last_profile == profile_id:
+                    preferences.last_profile = "default"
+
+            self._store_cache(preferences, servers, profiles, edit)
 
-            logger.info(f"Profile deleted: {profile_id}")
+            logger.info("Profile deleted: %s", profile_id)
             return True, None
 
         except Exception as e:
@@ -170,28 +382,21 @@ class ProfileManager:
             profile_id: Profile to retrieve
 
         Returns:
-            Profile object or None if not found
+            Copy of the Profile, or None if not found
         """
-        try:
-            _, _, profiles = self.config_manager.load()
-            return profiles.get(profile_id)
-        except Exception as e:
-            logger.error(f"Failed to get profile: {e}")
-            return None
+        state = self._load_cached()
+        profile = state[2].get(profile_id) if state else None
+        return deepcopy(profile) if profile is not None else None
 
     def list_profiles(self) -> Dict[str, Profile]:
         """
         Get all profiles.
 
         Returns:
-            Dictionary of profile_id -> Profile
+            Dictionary of profile_id -> Profile (copies the caller may modify)
         """
-        try:
-            _, _, profiles = self.config_manager.load()
-            return profiles
-        except Exception as e:
-            logger.error(f"Failed to list profiles: {e}")
-            return {}
+        state = self._load_cached()
+        return deepcopy(state[2]) if state else {}
 
     def switch_profile(
         self,
@@ -209,33 +414,45 @@ class ProfileManager:
             Tuple of (success, error_message, profile, servers_dict)
         """
         try:
-            # Load current config
-            preferences, servers, profiles = self.config_manager.load()
+            error = self._retry_failed_save()
+            if error:
+                return False, error, None, None
+            state = self._load_cached(mutable=True)
+            if state is None:
+                return False, "Failed to load configuration", None, None
+            preferences, servers, profiles = state
 
             profile = profiles.get(profile_id)
             if profile is None:
                 return False, f"Profile '{profile_id}' not found", None, None
 
             now = datetime.now()
-            preferences.last_profile = profile_id
-
             normalized_project = self._normalize_project_path(self.current_project_path)
-            if normalized_project:
-                preferences.project_last_profiles[normalized_project] = profile_id
-
+            enabled_set = frozenset(profile.servers)
+
+            # Replayed onto a config saved elsewhere, only the profile selection
+            # is reapplied; server toggles saved since then are left alone
+            def edit(preferences: Preferences, servers: Dict[str, MCPServer], profiles: Dict[str, Profile]):
+                preferences.last_profile = profile_id
+                if normalized_project:
+                    preferences.project_last_profiles[normalized_project] = profile_id
+
+                target = profiles.get(profile_id)
+                if target is not None:
+                    target.last_used = now
+                    target.modified = now
+                    target.scope = "global"
+                    target.project_path = None
+
+            edit(preferences, servers, profiles)
             for server_id, server in servers.items():
-                server.enabled = server_id in profile.servers
-
-            profile.last_used = now
-            profile.modified = now
-            profile.scope = "global"
-            profile.project_path = None
-            profiles[profile_id] = profile
-
-            self.config_manager.save(preferences, servers, profiles)
+                server.enabled = server_id in enabled_set
+            self._store_cache(preferences, servers, profiles, edit)
+            self._enabled_ids = [server_id for server_id in servers if server_id in enabled_set]
 
-            logger.info(f"Switched to profile: {profile_id} ({len(profile.servers)} servers)")
-            return True, None, profile, servers
+            logger.info("Switched to profile: %s (%s servers)", profile_id, len(profile.servers))
+            # Copies: toggling servers in the UI must not desync _enabled_ids
+            return True, None, deepcopy(profile), deepcopy(servers)
 
         except Exception as e:
             error_msg = f"Failed to switch profile: {e}"
@@ -249,12 +466,13 @@ class ProfileManager:
         Returns:
             List of server IDs that are enabled
         """
-        try:
-            _, servers, _ = self.config_manager.load()
-            return [sid for sid, server in servers.items() if server.enabled]
-        except Exception as e:
-            logger.error(f"Failed to get enabled servers: {e}")
-            return []
+        with self._flush_lock:
+            state = self._load_cached()
+            if not state:
+                return []
+            if self._enabled_ids is None:
+                self._enabled_ids = [sid for sid, server in state[1].items() if server.enabled]
+            return list(self._enabled_ids)
 
     def save_current_state_to_profile(
         self,
@@ -280,7 +498,7 @@ class ProfileManager:
             )
 
             if success:
-                logger.info(f"Saved current state to profile: {profile_id}")
+                logger.info("Saved current state to profile: %s", profile_id)
 
             return success, error
 
@@ -297,7 +515,7 @@ class ProfileManager:
             project_path: Path to current project directory
         """
         self.current_project_path = self._normalize_project_path(project_path)
-        logger.debug(f"Current project path set to: {project_path}")
+        logger.debug("Current project path set to: %s", project_path)
 
         if self.current_project_path:
             imported = self.config_manager.import_legacy_project_profiles(self.current_project_path)
@@ -315,14 +533,8 @@ class ProfileManager:
         Returns:
             Dictionary of profile_id -> Profile (global + project-specific)
         """
-        try:
-            _, _, profiles = self.config_manager.load()
-            logger.debug(f"Loaded {len(profiles)} profiles")
-            return profiles
-
-        except Exception as e:
-            logger.error(f"Failed to get all profiles: {e}")
-            return {}
+        state = self._load_cached()
+        return deepcopy(state[2]) if state else {}
 
     def create_profile_with_scope(
         self,
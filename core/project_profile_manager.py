@@ -5,22 +5,125 @@ This module manages profiles stored in <project_dir>/.cc-launcher/profiles.json
 alongside the global profiles stored in ~/.claude/cc-launch.json
 """
 
-import json
 import logging
+import os
+import stat
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
 
 from models.profile import Profile
+from utils import json_io
+from utils.file_io import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
+# Sentinel for dict.pop lookups that may miss
+_MISSING = object()
+
+# Projects remembered by the caches below; least recently used are evicted
+MAX_CACHED_PROJECTS = 32
+
+# project_path -> (config_dir, profiles_file) for directories already verified
+_project_path_cache: "OrderedDict[str, Tuple[Path, Path]]" = OrderedDict()
+
+# profiles_file -> ((mtime_ns, size), validated raw entries) from the last read
+_raw_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, dict]]]" = OrderedDict()
+
+
+def _cache_put(cache: OrderedDict, key: str, value) -> None:
+    """Store ``value`` as the most recently used entry, evicting beyond MAX_CACHED_PROJECTS."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > MAX_CACHED_PROJECTS:
+        cache.popitem(last=False)
+
+
+def _is_loadable(profile_id: str, profile_data) -> bool:
+    """Check Profile.from_dict accepts an entry, logging it if not.
+
+    Runs once per file version (see _raw_cache), so a mapping never lists a
+    key that later fails to materialize.
+    """
+    try:
+        if not isinstance(profile_data, dict):
+            raise ValueError("entry is not a mapping")
+        Profile.from_dict(profile_data)
+        return True
+    except Exception as e:
+        logger.error("Error loading project profile %s: %s", profile_id, e)
+        return False
+
+
+class LazyProfiles(MutableMapping):
+    """
+    Project profiles kept as parsed JSON until accessed.
+
+    Profile objects are built on first lookup and belong to this mapping
+    alone; separate loads never share them. When saved, entries that were
+    never accessed are written back from their raw dicts, so only profiles
+    the caller touched go through Profile.to_dict.
+    """
+
+    def __init__(self, raw: Dict[str, dict], project_path: str):
+        # profile_id -> raw dict, or None once a Profile exists for it
+        self._raw: Dict[str, Optional[dict]] = raw
+        self._profiles: Dict[str, Profile] = {}
+        self.project_path = project_path
+
+    def __getitem__(self, profile_id: str) -> Profile:
+        profile = self._profiles.get(profile_id)
+        if profile is None:
+            profile_data = self._raw[profile_id]
+            try:
+                profile = Profile.from_dict(profile_data)
+            except Exception as e:
+                logger.error("Error loading project profile %s: %s", profile_id, e)
+                raise KeyError(profile_id) from e
+            # The raw dict is shared through _raw_cache; keep edits off it
+            profile.servers = list(profile.servers)
+
+            # Ensure scope is set to project
+            profile.scope = "project"
+            profile.project_path = self.project_path
+            self._profiles[profile_id] = profile
+            self._raw[profile_id] = None
+        return profile
+
+    def __setitem__(self, profile_id: str, profile: Profile):
+        self._raw[profile_id] = None
+        self._profiles[profile_id] = profile
+
+    def __delitem__(self, profile_id: str):
+        del self._raw[profile_id]
+        self._profiles.pop(profile_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def serialized_items(self, project_path: str) -> Iterator[Tuple[str, dict]]:
+        """Yield (profile_id, dict) for project-scoped entries, in order."""
+        for profile_id, profile_data in self._raw.items():
+            if profile_data is None:
+                profile = self._profiles[profile_id]
+                if profile.scope == "project":
+                    yield profile_id, profile.to_dict()
+            elif profile_data.get("scope") == "project" and profile_data.get("project_path") == project_path:
+                yield profile_id, profile_data
+            else:
+                yield profile_id, {**profile_data, "scope": "project", "project_path": project_path}
+
 
 class ProjectProfileManager:
     """Manages project-specific profile storage."""
 
     PROJECT_CONFIG_DIR = ".cc-launcher"
     PROJECT_PROFILES_FILE = "profiles.json"
+    PROJECT_PROFILES_TMP = "profiles.json.tmp"
 
     @staticmethod
     def get_project_config_path(project_path: str) -> Optional[Path]:
@@ -37,16 +140,45 @@ class ProjectProfileManager:
             return None
 
         try:
-            proj_path = Path(project_path)
-            if not proj_path.exists() or not proj_path.is_dir():
-                return None
-
-            config_dir = proj_path / ProjectProfileManager.PROJECT_CONFIG_DIR
-            return config_dir
+            paths = ProjectProfileManager._resolve_project_paths(project_path)
+            return paths[0] if paths else None
 
         except Exception as e:
-            logger.error(f"Error getting project config path: {e}")
+            logger.error("Error getting project config path: %s", e)
+            return None
+
+    @staticmethod
+    def _resolve_project_paths(project_path: str) -> Optional[Tuple[Path, Path]]:
+        """Return (config_dir, profiles_file) for a project, memoized per path."""
+        cached = _project_path_cache.get(project_path)
+        if cached is not None:
+            _project_path_cache.move_to_end(project_path)
+            return cached
+
+        try:
+            st = os.stat(project_path)
+        except OSError:
             return None
+        if not stat.S_ISDIR(st.st_mode):
+            return None
+
+        config_dir = Path(project_path) / ProjectProfileManager.PROJECT_CONFIG_DIR
+        paths = (config_dir, config_dir / ProjectProfileManager.PROJECT_PROFILES_FILE)
+        _cache_put(_project_path_cache, project_path, paths)
+        return paths
+
+    @staticmethod
+    def clear_cache(project_path: Optional[str] = None):
+        """
+        Forget memoized project paths.
+
+        Args:
+            project_path: Project to forget, or None to clear every entry
+        """
+        if project_path is None:
+            _project_path_cache.clear()
+        else:
+            _project_path_cache.pop(project_path, None)
 
     @staticmethod
     def get_project_profiles_file(project_path: str) -> Optional[Path]:
@@ -59,55 +191,71 @@ class ProjectProfileManager:
         Returns:
             Path to profiles.json or None if project_path invalid
         """
-        config_dir = ProjectProfileManager.get_project_config_path(project_path)
-        if not config_dir:
+        if not project_path:
             return None
 
-        return config_dir / ProjectProfileManager.PROJECT_PROFILES_FILE
+        try:
+            paths = ProjectProfileManager._resolve_project_paths(project_path)
+            return paths[1] if paths else None
+
+        except Exception as e:
+            logger.error("Error getting project profiles file: %s", e)
+            return None
 
     @staticmethod
-    def load_project_profiles(project_path: str) -> Dict[str, Profile]:
+    def load_project_profiles(project_path: str) -> MutableMapping[str, Profile]:
         """
         Load profiles from project-specific storage.
 
+        Profiles are parsed lazily; see LazyProfiles.
+
         Args:
             project_path: Path to the project directory
 
         Returns:
-            Dictionary of profile_id -> Profile, empty dict if file doesn't exist
+            Mapping of profile_id -> Profile: a LazyProfiles mapping, not a
+            dict, so pass it through dict() before JSON encoding. An empty
+            dict if the file doesn't exist or can't be read.
         """
         profiles_file = ProjectProfileManager.get_project_profiles_file(project_path)
-        if not profiles_file or not profiles_file.exists():
-            logger.debug(f"No project profiles found at {project_path}")
+        try:
+            st = os.stat(profiles_file) if profiles_file else None
+        except OSError:
+            st = None
+        if st is None:
+            logger.debug("No project profiles found at %s", project_path)
             return {}
 
         try:
-            with open(profiles_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            profiles = {}
-            for profile_id, profile_data in data.items():
-                try:
-                    profile = Profile.from_dict(profile_data)
-                    # Ensure scope is set to project
-                    profile.scope = "project"
-                    profile.project_path = project_path
-                    profiles[profile_id] = profile
-                except Exception as e:
-                    logger.error(f"Error loading project profile {profile_id}: {e}")
-
-            logger.info(f"Loaded {len(profiles)} project profiles from {project_path}")
-            return profiles
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing project profiles JSON: {e}")
+            file_key = (st.st_mtime_ns, st.st_size)
+            cached = _raw_cache.get(str(profiles_file))
+            if cached is not None and cached[0] == file_key:
+                raw = cached[1]
+                _raw_cache.move_to_end(str(profiles_file))
+            else:
+                with open(profiles_file, 'rb') as f:
+                    data = json_io.loads(f.read())
+
+                raw = {
+                    profile_id: profile_data
+                    for profile_id, profile_data in data.items()
+                    if _is_loadable(profile_id, profile_data)
+                }
+                _cache_put(_raw_cache, str(profiles_file), (file_key, raw))
+
+            logger.info("Loaded %s project profiles from %s", len(raw), project_path)
+            # LazyProfiles edits its own dict; the cached one stays pristine
+            return LazyProfiles(dict(raw), project_path)
+
+        except json_io.JSONDecodeError as e:
+            logger.error("Error parsing project profiles JSON: %s", e)
             return {}
         except Exception as e:
-            logger.error(f"Error loading project profiles: {e}")
+            logger.error("Error loading project profiles: %s", e)
             return {}
 
     @staticmethod
-    def save_project_profiles(project_path: str, profiles: Dict[str, Profile]) -> Tuple[bool, Optional[str]]:
+    def save_project_profiles(project_path: str, profiles: MutableMapping[str, Profile]) -> Tuple[bool, Optional[str]]:
         """
         Save profiles to project-specific storage.
 
@@ -119,31 +267,36 @@ class ProjectProfileManager:
             Tuple of (success, error_message)
         """
         try:
-            config_dir = ProjectProfileManager.get_project_config_path(project_path)
-            if not config_dir:
+            # Re-check the project directory so a deleted project is not
+            # recreated by mkdir(parents=True) below
+            ProjectProfileManager.clear_cache(project_path)
+            paths = ProjectProfileManager._resolve_project_paths(project_path) if project_path else None
+            if not paths:
                 return False, "Invalid project path"
-
-            # Create config directory if it doesn't exist
-            config_dir.mkdir(parents=True, exist_ok=True)
-
-            profiles_file = config_dir / ProjectProfileManager.PROJECT_PROFILES_FILE
+            config_dir, profiles_file = paths
 
             # Convert profiles to dict format
-            data = {}
-            for profile_id, profile in profiles.items():
+            if isinstance(profiles, LazyProfiles):
+                data = dict(profiles.serialized_items(project_path))
+            else:
                 # Only save project-scoped profiles
-                if profile.scope == "project":
-                    data[profile_id] = profile.to_dict()
+                data = {
+                    profile_id: profile.to_dict()
+                    for profile_id, profile in profiles.items()
+                    if profile.scope == "project"
+                }
+
+            if not data:
+                ProjectProfileManager._remove_profiles_file(profiles_file, project_path)
+                return True, None
 
-            # Atomic write: temp file -> rename
-            temp_file = profiles_file.with_suffix('.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            # Create config directory if it doesn't exist
+            if not os.path.isdir(config_dir):
+                config_dir.mkdir(parents=True, exist_ok=True)
 
-            # Rename temp file to actual file (atomic on Windows)
-            temp_file.replace(profiles_file)
+            ProjectProfileManager._write_profiles_data(config_dir, data)
 
-            logger.info(f"Saved {len(data)} project profiles to {project_path}")
+            logger.info("Saved %s project profiles to %s", len(data), project_path)
             return True, None
 
         except Exception as e:
@@ -164,19 +317,47 @@ class ProjectProfileManager:
             Tuple of (success, error_message)
         """
         try:
-            # Load all project profiles
-            profiles = ProjectProfileManager.load_project_profiles(project_path)
+            paths = ProjectProfileManager._resolve_project_paths(project_path) if project_path else None
+            if not paths or not os.path.exists(paths[1]):
+                return False, f"Profile '{profile_id}' not found in project profiles"
+            config_dir, profiles_file = paths
+
+            # Work on the raw dict; no need to build Profile objects for one key
+            with open(profiles_file, 'rb') as f:
+                data = json_io.loads(f.read())
 
-            if profile_id not in profiles:
+            if data.pop(profile_id, _MISSING) is _MISSING:
                 return False, f"Profile '{profile_id}' not found in project profiles"
 
-            # Remove the profile
-            del profiles[profile_id]
+            if data:
+                ProjectProfileManager._write_profiles_data(config_dir, data)
+            else:
+                ProjectProfileManager._remove_profiles_file(profiles_file, project_path)
 
-            # Save updated profiles
-            return ProjectProfileManager.save_project_profiles(project_path, profiles)
+            logger.info("Deleted project profile %s from %s", profile_id, project_path)
+            return True, None
 
         except Exception as e:
             error_msg = f"Error deleting project profile: {e}"
             logger.error(error_msg)
             return False, error_msg
+
+    @staticmethod
+    def _remove_profiles_file(profiles_file: Path, project_path: str) -> None:
+        """Drop the profiles file once no project profiles are left, rather than writing "{}"."""
+        _raw_cache.pop(str(profiles_file), None)
+        try:
+            os.unlink(profiles_file)
+            logger.info("Removed empty project profiles file from %s", project_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _write_profiles_data(config_dir: Path, data: Dict) -> None:
+        """Atomically write raw profile data: temp file -> rename."""
+        dir_str = os.fspath(config_dir)
+        profiles_file = os.path.join(dir_str, ProjectProfileManager.PROJECT_PROFILES_FILE)
+        temp_file = os.path.join(dir_str, ProjectProfileManager.PROJECT_PROFILES_TMP)
+        _raw_cache.pop(profiles_file, None)
+
+        atomic_write_bytes(profiles_file, json_io.dumps(data, indent=True), temp_file)
@@ -7,14 +7,17 @@ Supports caching to reduce network calls and offline mode.
 
 import asyncio
 import aiohttp
-import json
+import functools
 import logging
 import shutil
-import subprocess
+import time
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
 from models.server import MCPServer, ValidationStatus
+from utils import json_io
+from utils.file_io import atomic_write_bytes
 from utils.constants import CONFIG_DIR
 
 logger = logging.getLogger(__name__)
@@ -22,8 +25,32 @@ logger = logging.getLogger(__name__)
 # Validation cache file
 CACHE_FILE = CONFIG_DIR / "cc-validation-cache.json"
 CACHE_EXPIRY_HOURS = 24
+MAX_CACHE_ENTRIES = 500  # least recently used entries are evicted beyond this
 NPM_REGISTRY_URL = "https://registry.npmjs.org"
 NPM_TIMEOUT = 5  # seconds
+NPM_MAX_CONNECTIONS = 10  # pooled keep-alive connections to the registry
+NPM_LIST_TIMEOUT = 5  # seconds
+GLOBAL_NPM_INDEX_TTL = 60  # seconds between global package scans
+NPM_MAX_CONCURRENT = 8  # registry requests in flight at once (avoids HTTP 429)
+HTTP_PROBE_TIMEOUT = 3  # seconds for the HEAD probe of HTTP servers
+
+
+@functools.lru_cache(maxsize=512)
+def _extract_pkg(args: Tuple[str, ...]) -> Optional[str]:
+    """Find the NPM package name in a stdio server's args (memoized per args tuple)."""
+    # Pattern: npx -y @scope/package or npx package-name
+    for i, arg in enumerate(args):
+        if arg in ("npx", "-y") and i + 1 < len(args):
+            next_arg = args[i + 1]
+            if next_arg not in ("-y", "--yes"):
+                return next_arg
+
+    # Fallback: find last arg that resembles a package name
+    for arg in reversed(args):
+        if arg.startswith("@") or ("-" in arg and not arg.startswith("-")):
+            return arg
+
+    return None
 
 
 class ServerValidator:
@@ -37,28 +64,94 @@ class ServerValidator:
             skip_validation: Skip validation (offline mode)
         """
         self.skip_validation = skip_validation
-        self.cache: Dict[str, dict] = {}
+        # Ordered least to most recently used
+        self.cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._npm_semaphore: Optional[asyncio.Semaphore] = None
+        # package name -> in-flight check shared by servers using that package
+        self._package_checks: Dict[str, asyncio.Future] = {}
+        self._global_npm_deps: Optional[Dict[str, dict]] = None
+        self._global_npm_loaded_at = 0.0
+        self._global_npm_scan: Optional[asyncio.Future] = None
+        # Set while validate_all_servers runs so the cache is written once
+        self._defer_save = False
+        # raw ``last_checked`` string -> parsed datetime for cache entries
+        self._parsed_last_checked: Dict[str, datetime] = {}
         self._load_cache()
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared registry session, creating it on first use.
+
+        Sessions are bound to an event loop, so a new one (and a new request
+        semaphore) is created when called from a different loop than the
+        current session's.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            await self._close_stale_session()
+            connector = aiohttp.TCPConnector(
+                limit=NPM_MAX_CONNECTIONS,
+                limit_per_host=NPM_MAX_CONNECTIONS,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=NPM_TIMEOUT),
+                connector=connector
+            )
+            self._session_loop = loop
+            self._npm_semaphore = asyncio.Semaphore(NPM_MAX_CONCURRENT)
+        return self._session
+
+    async def _close_stale_session(self):
+        """Close a session left over from another event loop before replacing it"""
+        session = self._session
+        self._session = None
+        self._session_loop = None
+        if session is None or session.closed:
+            return
+        try:
+            await session.close()
+        except RuntimeError as e:
+            # The session's loop is already closed, so its sockets can't be
+            # shut down cleanly; drop the connector so it isn't reported as leaked
+            logger.debug(f"Discarding registry session from closed loop: {e}")
+            session.detach()
+
+    async def close(self):
+        """Close the shared registry session. Call from the loop that used it."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
     def _load_cache(self):
         """Load validation cache from disk"""
         try:
             if CACHE_FILE.exists():
-                with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                    self.cache = json.load(f)
+                self.cache = OrderedDict(json_io.loads(CACHE_FILE.read_bytes()))
+                while len(self.cache) > MAX_CACHE_ENTRIES:
+                    self.cache.popitem(last=False)
+                self._parsed_last_checked.clear()
+                for entry in self.cache.values():
+                    self._parse_last_checked(entry.get("last_checked"))
                 logger.info(f"Validation cache loaded: {len(self.cache)} entries")
             else:
                 logger.info("No validation cache found, starting fresh")
         except Exception as e:
             logger.error(f"Error loading validation cache: {e}")
-            self.cache = {}
+            self.cache = OrderedDict()
 
     def _save_cache(self):
-        """Save validation cache to disk"""
+        """Save validation cache to disk (temp file + rename)"""
+        if self._defer_save:
+            return
+
         try:
             CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-            with open(CACHE_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.cache, f, indent=2)
+            atomic_write_bytes(CACHE_FILE, json_io.dumps(self.cache))
             logger.debug("Validation cache saved")
         except Exception as e:
             logger.error(f"Error saving validation cache: {e}")
@@ -73,11 +166,32 @@ class ServerValidator:
             return f"http:{server.url}"
         return f"unknown:{server.id}"
 
-    def _is_cache_valid(self, cache_entry: dict) -> bool:
-        """Check if cache entry is still valid"""
+    def _parse_last_checked(self, value: Optional[str]) -> Optional[datetime]:
+        """Parse a cache timestamp, reusing earlier results for the same string"""
+        if not value:
+            return None
+        parsed = self._parsed_last_checked.get(value)
+        if parsed is None:
+            try:
+                parsed = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                return None
+            self._parsed_last_checked[value] = parsed
+        return parsed
+
+    def _is_cache_valid(self, cache_entry: dict, now: Optional[datetime] = None) -> bool:
+        """
+        Check if cache entry is still valid
+
+        Args:
+            cache_entry: Cached validation dict
+            now: Reference time, so a batch can share one clock reading
+        """
         try:
-            last_checked = datetime.fromisoformat(cache_entry.get("last_checked", ""))
-            age = datetime.now(timezone.utc) - last_checked
+            last_checked = self._parse_last_checked(cache_entry.get("last_checked"))
+            if last_checked is None:
+                return False
+            age = (now or datetime.now(timezone.utc)) - last_checked
             return age < timedelta(hours=CACHE_EXPIRY_HOURS)
         except Exception:
             return False
@@ -94,21 +208,7 @@ class ServerValidator:
         """
         if server.type != "stdio" or not server.args:
             return None
-
-        # Pattern: npx -y @scope/package or npx package-name
-        args = server.args
-        for i, arg in enumerate(args):
-            if arg in ["npx", "-y"] and i + 1 < len(args):
-                next_arg = args[i + 1]
-                if next_arg not in ["-y", "--yes"]:
-                    return next_arg
-
-        # Fallback: find last arg that resembles a package name
-        for arg in reversed(args):
-            if arg.startswith("@") or ("-" in arg and not arg.startswith("-")):
-                return arg
-
-        return None
+        return _extract_pkg(tuple(server.args))
 
     async def check_npm_package(self, package_name: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """
@@ -122,22 +222,21 @@ class ServerValidator:
         """
         try:
             url = f"{NPM_REGISTRY_URL}/{package_name}"
-            timeout = aiohttp.ClientTimeout(total=NPM_TIMEOUT)
-
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        version = data.get("dist-tags", {}).get("latest", "unknown")
-                        logger.debug(f"NPM package '{package_name}' found: {version}")
-                        return True, version, None
-                    elif response.status == 404:
-                        logger.debug(f"NPM package '{package_name}' not found")
-                        return False, None, "Package not found in NPM registry"
-                    else:
-                        error = f"NPM registry returned status {response.status}"
-                        logger.warning(error)
-                        return False, None, error
+            session = await self._get_session()
+
+            async with self._npm_semaphore, session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json(loads=json_io.loads)
+                    version = data.get("dist-tags", {}).get("latest", "unknown")
+                    logger.debug(f"NPM package '{package_name}' found: {version}")
+                    return True, version, None
+                elif response.status == 404:
+                    logger.debug(f"NPM package '{package_name}' not found")
+                    return False, None, "Package not found in NPM registry"
+                else:
+                    error = f"NPM registry returned status {response.status}"
+                    logger.warning(error)
+                    return False, None, error
 
         except asyncio.TimeoutError:
             error = f"Timeout checking NPM package '{package_name}'"
@@ -148,57 +247,179 @@ class ServerValidator:
             logger.error(error)
             return False, None, error
 
-    def check_local_installation(self, package_name: str) -> Tuple[bool, Optional[str]]:
+    async def check_http_endpoint(self, url: str) -> Tuple[bool, Optional[str]]:
         """
-        Check if package is installed locally (global npm)
+        Probe an HTTP server URL with a HEAD request.
+
+        Any response below 500 counts as reachable: MCP endpoints commonly
+        answer HEAD with 401/405 without a session.
 
         Args:
-            package_name: Package name
+            url: Server URL
 
         Returns:
-            Tuple of (installed, version)
+            Tuple of (reachable, error_message)
         """
         try:
-            if shutil.which("npm") is None:
-                logger.warning("npm executable not found; skipping local check for '%s'", package_name)
-                return False, None
-
-            # Run: npm list -g <package> --depth=0 --json
-            result = subprocess.run(
-                ["npm", "list", "-g", package_name, "--depth=0", "--json"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            session = await self._get_session()
+            async with session.head(
+                url,
+                allow_redirects=True,
+                timeout=aiohttp.ClientTimeout(total=HTTP_PROBE_TIMEOUT)
+            ) as response:
+                if response.status < 500:
+                    logger.debug(f"HTTP endpoint '{url}' reachable: {response.status}")
+                    return True, None
+                error = f"Server returned status {response.status}"
+                logger.warning(f"HTTP endpoint '{url}': {error}")
+                return False, error
 
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                dependencies = data.get("dependencies", {})
-                if package_name in dependencies:
-                    version = dependencies[package_name].get("version", "unknown")
-                    logger.debug(f"Package '{package_name}' installed locally: {version}")
-                    return True, version
+        except asyncio.TimeoutError:
+            error = f"Timeout connecting to '{url}'"
+            logger.warning(error)
+            return False, error
+        except Exception as e:
+            error = f"Error connecting to '{url}': {e}"
+            logger.warning(error)
+            return False, error
 
-            logger.debug(f"Package '{package_name}' not installed locally")
-            return False, None
+    async def _load_global_npm_index(self) -> Dict[str, dict]:
+        """
+        Return the globally installed npm packages, scanning at most once per
+        GLOBAL_NPM_INDEX_TTL seconds. Concurrent callers share one scan.
 
-        except subprocess.TimeoutExpired:
-            logger.warning(f"Timeout checking local installation of '{package_name}'")
-            return False, None
+        Returns:
+            Mapping of package name -> npm list entry (has "version")
+        """
+        if (
+            self._global_npm_deps is not None
+            and time.monotonic() - self._global_npm_loaded_at < GLOBAL_NPM_INDEX_TTL
+        ):
+            return self._global_npm_deps
+
+        scan = self._global_npm_scan
+        if scan is None or scan.get_loop() is not asyncio.get_running_loop():
+            scan = self._global_npm_scan = asyncio.ensure_future(self._scan_global_npm())
+
+            def forget(done: asyncio.Future):
+                if self._global_npm_scan is done:
+                    self._global_npm_scan = None
+
+            scan.add_done_callback(forget)
+        return await asyncio.shield(scan)
+
+    async def _scan_global_npm(self) -> Dict[str, dict]:
+        """Run `npm list -g` without blocking the event loop."""
+        deps: Dict[str, dict] = {}
+        try:
+            npm = shutil.which("npm")
+            if npm is None:
+                logger.warning("npm executable not found; skipping local installation checks")
+            else:
+                # Run: npm list -g --depth=0 --json (one scan for every package)
+                proc = await asyncio.create_subprocess_exec(
+                    npm, "list", "-g", "--depth=0", "--json",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                try:
+                    stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=NPM_LIST_TIMEOUT)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise
+
+                # npm exits non-zero on problems such as missing peers but
+                # still prints the tree
+                if stdout:
+                    deps = json_io.loads(stdout).get("dependencies", {})
+
+        except asyncio.TimeoutError:
+            logger.warning("Timeout listing global npm packages")
         except FileNotFoundError:
-            logger.warning("npm executable not found while checking '%s'", package_name)
-            return False, None
+            logger.warning("npm executable not found while listing global packages")
         except Exception as e:
-            logger.error(f"Error checking local installation of '{package_name}': {e}")
+            logger.error(f"Error listing global npm packages: {e}")
+
+        self._global_npm_deps = deps
+        self._global_npm_loaded_at = time.monotonic()
+        return deps
+
+    async def check_local_installation(self, package_name: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check if package is installed locally (global npm)
+
+        Args:
+            package_name: Package name
+
+        Returns:
+            Tuple of (installed, version)
+        """
+        entry = (await self._load_global_npm_index()).get(package_name)
+        if entry is None:
+            logger.debug(f"Package '{package_name}' not installed locally")
             return False, None
 
-    async def validate_server(self, server: MCPServer, force_refresh: bool = False) -> MCPServer:
+        version = entry.get("version", "unknown")
+        logger.debug(f"Package '{package_name}' installed locally: {version}")
+        return True, version
+
+    async def _check_package(self, package_name: str):
+        """
+        Run the registry and local checks for a package, once per package.
+
+        Servers that share a package and are validated concurrently (e.g. by
+        validate_all_servers) await the same in-flight check.
+
+        Returns:
+            Tuple of (check_npm_package result, check_local_installation result)
+        """
+        check = self._package_checks.get(package_name)
+        if check is None or check.get_loop() is not asyncio.get_running_loop():
+            check = asyncio.ensure_future(self._run_package_check(package_name))
+            self._package_checks[package_name] = check
+
+            def forget(done: asyncio.Future):
+                if self._package_checks.get(package_name) is done:
+                    del self._package_checks[package_name]
+
+            check.add_done_callback(forget)
+        return await asyncio.shield(check)
+
+    async def _run_package_check(self, package_name: str):
+        """Check a package in the registry and the global npm install concurrently."""
+        return await asyncio.gather(
+            self.check_npm_package(package_name),
+            self.check_local_installation(package_name)
+        )
+
+    def _apply_cached(self, server: MCPServer, cache_key: str,
+                      now: Optional[datetime] = None) -> bool:
+        """
+        Copy a still-valid cached validation onto the server.
+
+        Returns:
+            True if the cache answered for this server
+        """
+        cache_entry = self.cache.get(cache_key)
+        if cache_entry is None or not self._is_cache_valid(cache_entry, now):
+            return False
+
+        logger.debug(f"Using cached validation for '{server.id}'")
+        self.cache.move_to_end(cache_key)
+        server.validation = ValidationStatus.from_dict(cache_entry)
+        server.validation.cached = True
+        return True
+
+    async def validate_server(self, server: MCPServer, force_refresh: bool = False,
+                              now: Optional[datetime] = None) -> MCPServer:
         """
         Validate a single server.
 
         Args:
             server: MCPServer to validate
             force_refresh: Bypass cache and force fresh validation
+            now: Reference time for cache expiry (defaults to the current time)
 
         Returns:
             MCPServer with updated validation status
@@ -208,13 +429,8 @@ class ServerValidator:
             return server
 
         cache_key = self._get_cache_key(server)
-        if not force_refresh and cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if self._is_cache_valid(cache_entry):
-                logger.debug(f"Using cached validation for '{server.id}'")
-                server.validation = ValidationStatus.from_dict(cache_entry)
-                server.validation.cached = True
-                return server
+        if not force_refresh and self._apply_cached(server, cache_key, now):
+            return server
 
         validation = ValidationStatus()
         validation.last_checked = datetime.now(timezone.utc)
@@ -223,12 +439,12 @@ class ServerValidator:
         if server.type == "stdio":
             package_name = self.extract_package_name(server)
             if package_name:
-                npm_available, npm_version, error = await self.check_npm_package(package_name)
+                (npm_available, npm_version, error), (locally_installed, local_version) = \
+                    await self._check_package(package_name)
                 validation.npm_available = npm_available
                 validation.npm_version = npm_version
                 validation.error_message = error
 
-                locally_installed, local_version = self.check_local_installation(package_name)
                 validation.locally_installed = locally_installed
                 validation.local_version = local_version
 
@@ -238,53 +454,102 @@ class ServerValidator:
                 logger.warning(f"Could not extract package name for '{server.id}'")
 
         elif server.type == "http":
-            # Mark as valid if URL is present (actual reachability check would be expensive)
             if server.url:
-                validation.npm_available = True
-                logger.info(f"HTTP server '{server.id}' validated (URL present)")
+                reachable, error = await self.check_http_endpoint(server.url)
+                validation.endpoint_reachable = reachable
+                validation.error_message = error
+                logger.info(f"Validated HTTP server '{server.id}': reachable={reachable}")
             else:
                 validation.error_message = "No URL specified"
 
         server.validation = validation
 
-        self.cache[cache_key] = validation.to_dict()
+        previous = self.cache.get(cache_key)
+        if previous:
+            self._parsed_last_checked.pop(previous.get("last_checked"), None)
+        entry = validation.to_dict()
+        self._parsed_last_checked[entry["last_checked"]] = validation.last_checked
+        self.cache[cache_key] = entry
+        self.cache.move_to_end(cache_key)
+        while len(self.cache) > MAX_CACHE_ENTRIES:
+            _, evicted = self.cache.popitem(last=False)
+            self._parsed_last_checked.pop(evicted.get("last_checked"), None)
         self._save_cache()
 
         return server
 
     async def validate_all_servers(self, servers: Dict[str, MCPServer],
-                                    force_refresh: bool = False) -> Dict[str, MCPServer]:
+                                    force_refresh: bool = False,
+                                    on_result: Optional[Callable[[MCPServer], None]] = None
+                                    ) -> Dict[str, MCPServer]:
         """
         Validate all servers in parallel
 
         Args:
             servers: Dictionary of server_id -> MCPServer
             force_refresh: Bypass cache for all servers
+            on_result: Called with each server as soon as its validation finishes
+                (cache hits first, then in completion order)
 
         Returns:
             Updated dictionary of servers with validation status
         """
         logger.info(f"Validating {len(servers)} servers...")
 
-        # Create validation tasks
-        tasks = [
-            self.validate_server(server, force_refresh)
-            for server in servers.values()
-        ]
+        if force_refresh:
+            # Rescan global packages once for the whole batch
+            self._global_npm_deps = None
 
-        # Run in parallel
-        validated_servers = await asyncio.gather(*tasks, return_exceptions=True)
+        def report(server: MCPServer):
+            if on_result is not None:
+                try:
+                    on_result(server)
+                except Exception as e:
+                    logger.error(f"Error in validation progress callback: {e}")
 
-        # Build result dict
+        # Answer fresh cache hits up front, judging expiry against one clock reading
+        now = datetime.now(timezone.utc)
         result = {}
-        for i, server_or_exception in enumerate(validated_servers):
-            if isinstance(server_or_exception, Exception):
-                # Log error and use original server
-                server_id = list(servers.keys())[i]
-                logger.error(f"Error validating server '{server_id}': {server_or_exception}")
-                result[server_id] = servers[server_id]
+        pending = {}
+        for server_id, server in servers.items():
+            if (not force_refresh and not self.skip_validation
+                    and self._apply_cached(server, self._get_cache_key(server), now)):
+                result[server_id] = server
+                report(server)
             else:
-                result[server_or_exception.id] = server_or_exception
+                result[server_id] = None  # keeps the input order
+                pending[server_id] = server
+
+        if pending:
+            async def validate_one(server_id: str, server: MCPServer):
+                try:
+                    return server_id, await self.validate_server(server, force_refresh, now)
+                except Exception as e:
+                    return server_id, e
+
+            # Validate the rest in parallel, writing the cache once at the end
+            tasks = [
+                asyncio.ensure_future(validate_one(server_id, server))
+                for server_id, server in pending.items()
+            ]
+            self._defer_save = True
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    server_id, server_or_exception = await next_done
+                    if isinstance(server_or_exception, Exception):
+                        # Log error and use original server
+                        logger.error(f"Error validating server '{server_id}': {server_or_exception}")
+                        server_or_exception = pending[server_id]
+                    result[server_id] = server_or_exception
+                    report(server_or_exception)
+            finally:
+                # Stop outstanding checks if the caller cancelled the batch
+                for task in tasks:
+                    task.cancel()
+                self._defer_save = False
+                self._save_cache()
+        else:
+            logger.debug("All servers answered from cache")
 
         logger.info(f"Validation complete: {len(result)} servers")
         return result
@@ -292,6 +557,8 @@ class ServerValidator:
     def refresh_cache(self):
         """Clear validation cache to force fresh checks"""
         self.cache.clear()
+        self._parsed_last_checked.clear()
+        self._global_npm_deps = None
         try:
             if CACHE_FILE.exists():
                 CACHE_FILE.unlink()
@@ -1,11 +1,12 @@
 """System tray integration for Claude Code MCP Manager."""
 
+import functools
 import logging
 import os
 import sys
 import threading
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 import pystray
 from PIL import Image
@@ -14,6 +15,22 @@ from utils.constants import APP_NAME
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the tray thread to build the icon before stopping it
+TRAY_READY_TIMEOUT = 2.0
+
+# Decoded tray icons, so recreating the tray does not re-read the PNG
+_ICON_CACHE: Dict[Path, Image.Image] = {}
+
+
+def _load_icon_image(icon_path: Path) -> Image.Image:
+    """Return the decoded icon image, loading it once per process."""
+    icon_image = _ICON_CACHE.get(icon_path)
+    if icon_image is None:
+        with Image.open(icon_path) as source:
+            icon_image = _ICON_CACHE.setdefault(icon_path, source.copy())
+        logger.info(f"Loaded icon from: {icon_path}")
+    return icon_image
+
 
 class SystemTrayManager:
     """Manages system tray icon and menu using pystray."""
@@ -46,6 +63,12 @@ class SystemTrayManager:
         self.switch_profile_callback = switch_profile_callback
         self.icon = None
         self.tray_thread = None
+        # Set once the tray thread has built the icon (or failed to)
+        self._tray_ready = threading.Event()
+        # Recent Profiles submenu items, rebuilt only after invalidate_profile_menu()
+        self._profile_menu_cache: Optional[Tuple[pystray.MenuItem, ...]] = None
+        self._profile_menu_cache_version = -1
+        self._profile_menu_version = 0
 
         logger.info("SystemTrayManager initialized")
 
@@ -54,8 +77,12 @@ class SystemTrayManager:
         Create and start system tray icon with menu.
         Runs in separate thread to avoid blocking Tkinter.
         
+        Icon decode and menu construction happen on the tray thread; if they
+        fail, the failure is reported back on the Tk thread through
+        show_tray_unavailable_message().
+
         Returns:
-            True if tray icon was created successfully, False otherwise
+            True if the tray thread was started (or is already running), False otherwise
         """
         try:
             preferences = getattr(self.tk_root, "preferences", None)
@@ -65,58 +92,71 @@ class SystemTrayManager:
 
             if not self._is_tray_available():
                 logger.warning("System tray not available on this platform/desktop environment")
-                if hasattr(self.tk_root, "show_tray_unavailable_message"):
-                    self.tk_root.after(0, self.tk_root.show_tray_unavailable_message)
+                self._report_tray_unavailable()
                 return False
                 
-            if self.icon is not None:
+            if self.tray_thread is not None and self.tray_thread.is_alive():
                 logger.debug("System tray icon already running")
                 return True
 
-            icon_image = Image.open(self.icon_path)
-            logger.info(f"Loaded icon from: {self.icon_path}")
-
-            menu_items = [
-                pystray.MenuItem("Open Launcher", self._on_open),
-                pystray.MenuItem("Quick Launch", self._on_quick_launch),
-            ]
-
-            if self.get_recent_profiles_callback and self.switch_profile_callback:
-                menu_items.append(pystray.Menu.SEPARATOR)
-                menu_items.append(
-                    pystray.MenuItem("Recent Profiles", self._create_profiles_menu)
-                )
-
-            menu_items.extend([
-                pystray.Menu.SEPARATOR,
-                pystray.MenuItem("Exit", self._on_exit)
-            ])
-
-            menu = pystray.Menu(*menu_items)
-
-            self.icon = pystray.Icon(
-                "cc-launcher",
-                icon_image,
-                APP_NAME,
-                menu
-            )
-
+            # Icon decode and menu construction happen on the tray thread so
+            # they stay off the Tk startup path
+            self._tray_ready.clear()
             self.tray_thread = threading.Thread(
                 target=self._run_tray_icon,
                 daemon=True
             )
             self.tray_thread.start()
 
-            logger.info("System tray icon created and started")
+            logger.info("System tray icon thread started")
             return True
 
         except Exception as e:
             logger.error(f"Failed to create system tray icon: {e}")
             return False
 
+    def _build_icon(self) -> pystray.Icon:
+        """Build the pystray icon and its menu."""
+        icon_image = _load_icon_image(self.icon_path)
+
+        menu_items = [
+            pystray.MenuItem("Open Launcher", self._on_open),
+            pystray.MenuItem("Quick Launch", self._on_quick_launch),
+        ]
+
+        if self.get_recent_profiles_callback and self.switch_profile_callback:
+            menu_items.append(pystray.Menu.SEPARATOR)
+            menu_items.append(
+                pystray.MenuItem("Recent Profiles", pystray.Menu(self._profile_menu_items))
+            )
+
+        menu_items.extend([
+            pystray.Menu.SEPARATOR,
+            pystray.MenuItem("Exit", self._on_exit)
+        ])
+
+        return pystray.Icon(
+            "cc-launcher",
+            icon_image,
+            APP_NAME,
+            pystray.Menu(*menu_items)
+        )
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the tray thread to finish building the icon.
+
+        Returns:
+            True if the icon is available, False otherwise
+        """
+        return self._tray_ready.wait(timeout) and self.icon is not None
+
     def destroy_tray_icon(self):
         """Stop the system tray icon if it is running."""
         try:
+            if self.tray_thread is not None and self.tray_thread.is_alive():
+                self._tray_ready.wait(TRAY_READY_TIMEOUT)
+
             if self.icon:
                 logger.info("Stopping system tray icon at user request")
                 try:
@@ -155,12 +195,24 @@ class SystemTrayManager:
             logger.error("Error while checking system tray availability: %s", exc)
             return False
 
+    def _report_tray_unavailable(self):
+        """Tell the main window there is no tray icon (thread-safe)."""
+        if hasattr(self.tk_root, "show_tray_unavailable_message"):
+            self.tk_root.after(0, self.tk_root.show_tray_unavailable_message)
+
     def _run_tray_icon(self):
-        """Run the system tray icon (blocking call, runs in thread)."""
+        """Build and run the system tray icon (blocking call, runs in thread)."""
         try:
+            try:
+                self.icon = self._build_icon()
+            finally:
+                self._tray_ready.set()
+            logger.info("System tray icon created")
             self.icon.run()
         except Exception as e:
             logger.error(f"System tray error: {e}")
+            self.icon = None
+            self._report_tray_unavailable()
 
     def _on_open(self, icon, item):
         """Handle 'Open Launcher' menu item - must be thread-safe."""
@@ -177,47 +229,65 @@ class SystemTrayManager:
         logger.info("Exit clicked from tray")
         self.tk_root.after(0, self.exit_app)
 
-    def _create_profiles_menu(self, item):
+    def invalidate_profile_menu(self):
+        """Drop the cached Recent Profiles submenu after profiles change."""
+        self._profile_menu_version += 1
+
+    def _profile_menu_items(self) -> Tuple[pystray.MenuItem, ...]:
         """
-        Create submenu with recent profiles.
-        Called dynamically when Recent Profiles is clicked.
+        Build the Recent Profiles submenu items.
+        Called by pystray whenever the submenu is shown; the items are
+        reused until invalidate_profile_menu() is called.
         """
+        version = self._profile_menu_version
+        if self._profile_menu_cache is not None and self._profile_menu_cache_version == version:
+            return self._profile_menu_cache
+
         try:
             recent_profiles = self.get_recent_profiles_callback()
 
-            if not recent_profiles:
-                return pystray.Menu(
-                    pystray.MenuItem("(No recent profiles)", None, enabled=False)
-                )
-
-            # Create menu items for each profile
-            profile_items = []
-            for profile_id, profile_name in recent_profiles:
-                # Create a closure to capture profile_id
-                def make_handler(pid):
-                    return lambda icon, item: self._on_profile_selected(pid)
-
-                profile_items.append(
-                    pystray.MenuItem(profile_name, make_handler(profile_id))
+            if recent_profiles:
+                items = tuple(
+                    pystray.MenuItem(profile_name, functools.partial(self._profile_clicked, profile_id))
+                    for profile_id, profile_name in recent_profiles
                 )
+            else:
+                items = (pystray.MenuItem("(No recent profiles)", None, enabled=False),)
 
-            return pystray.Menu(*profile_items)
+            # Tagged with the version read before the callback, so an
+            # invalidation during the build forces another rebuild
+            self._profile_menu_cache = items
+            self._profile_menu_cache_version = version
+            return items
 
         except Exception as e:
             logger.error(f"Error creating profiles menu: {e}")
-            return pystray.Menu(
-                pystray.MenuItem("(Error loading profiles)", None, enabled=False)
-            )
+            return (pystray.MenuItem("(Error loading profiles)", None, enabled=False),)
+
+    def _profile_clicked(self, profile_id: str, icon, item):
+        """Handle a Recent Profiles menu item - must be thread-safe."""
+        self._on_profile_selected(profile_id)
 
     def _on_profile_selected(self, profile_id: str):
         """Handle profile selection from tray menu."""
         logger.info(f"Profile '{profile_id}' selected from tray")
         if self.switch_profile_callback:
-            self.tk_root.after(0, lambda: self.switch_profile_callback(profile_id))
+            self.tk_root.after(0, self.switch_profile_callback, profile_id)
 
     def minimize_to_tray(self):
         """Hide the main window (minimize to tray)."""
         logger.info("Minimizing to tray")
+        if self.tray_thread is not None and self.tray_thread.is_alive():
+            # Make sure the icon exists so the window can be restored
+            has_icon = self.wait_until_ready(TRAY_READY_TIMEOUT)
+        else:
+            has_icon = self.icon is not None
+
+        if not has_icon:
+            # Withdrawing without an icon would leave no way back to the window
+            logger.warning("System tray icon unavailable; minimizing window instead")
+            self.tk_root.iconify()
+            return
         self.tk_root.withdraw()
 
     def restore_window(self):
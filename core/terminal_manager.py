@@ -1,24 +1,56 @@
 """Terminal Manager - Handles terminal detection and launch command generation."""
 
-import json
+import atexit
+import hashlib
 import logging
+import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
-import uuid
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-import psutil
-
 from models.server import MCPServer
+from utils import json_io
 from utils.env_expander import expand_env_vars_in_list
 
 logger = logging.getLogger(__name__)
 
 
 CLAUDE_CLI_COMMAND = "claude"
+POWERSHELL_PROBE_TIMEOUT = 2  # seconds for `pwsh/powershell -Command $PSVersionTable`
+STALE_CONFIG_SECONDS = 24 * 60 * 60  # leftover cc-mcp-*.json files older than this are removed
+
+# A cmdline argument naming the Claude CLI: a path ending in claude/claude.exe,
+# the bare command, or anything under a claude-code package
+_CLAUDE_CMDLINE_RE = re.compile(r"(?:^|/)claude(?:\.exe)?$|claude-code")
+_SLASH_TABLE = str.maketrans("\\", "/")
+
+# On Linux the process scan reads procfs directly instead of going through psutil
+_PROC_ROOT = "/proc"
+_USE_PROCFS = sys.platform.startswith("linux") and os.path.isdir(_PROC_ROOT)
+
+# Single-pass escapes for paths embedded in generated shell commands
+_BASH_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", '"': '\\"', "$": "\\$", "`": "\\`"})
+_POWERSHELL_ESCAPE_TABLE = str.maketrans({'"': '`"'})
+
+# Hash of the payload this process last wrote to each MCP config path. Keyed by
+# path because every TerminalManager in the process shares the same file.
+_config_hashes: Dict[Path, bytes] = {}
+
+_live_managers: "weakref.WeakSet[TerminalManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _cleanup_live_managers():
+    """Remove the MCP config files of every TerminalManager still alive at exit."""
+    for manager in list(_live_managers):
+        manager.cleanup_temp_config()
 
 
 class TerminalType:
@@ -36,95 +68,104 @@ class TerminalType:
     SH = "sh"
 
 
+def _platform_shells(platform: str) -> Tuple[Tuple[str, ...], str]:
+    """Return (shells to look for in order, fallback) for a sys.platform value."""
+    if platform == "win32":
+        # Windows Terminal is probed separately (it is not only a PATH lookup)
+        return (TerminalType.POWERSHELL_7, TerminalType.POWERSHELL_5), TerminalType.CMD
+    if platform == "darwin":
+        # macOS changed default shell from bash to zsh in Catalina (10.15)
+        return (TerminalType.ZSH, TerminalType.BASH, TerminalType.SH), TerminalType.BASH
+    if platform.startswith("linux") or platform.startswith("freebsd"):
+        return (TerminalType.BASH, TerminalType.ZSH, TerminalType.SH), TerminalType.BASH
+    return (), TerminalType.BASH
+
+
+# sys.platform is fixed for the process, so resolve the candidates once
+_IS_WINDOWS = sys.platform == "win32"
+_PLATFORM_SHELL_CANDIDATES, _PLATFORM_FALLBACK_SHELL = _platform_shells(sys.platform)
+# Helper probes from the GUI must not flash a console window on Windows
+_SUBPROCESS_KWARGS = {"creationflags": subprocess.CREATE_NO_WINDOW} if _IS_WINDOWS else {}
+
+
 class TerminalManager:
     """Manages terminal detection and generation of Claude Code launch commands."""
 
     def __init__(self) -> None:
         self.temp_config_path: Optional[Path] = None
+        # One config file per launcher process, rewritten on each generation.
+        # gettempdir() only returns a directory that already exists.
+        self._config_path = Path(tempfile.gettempdir()) / f"cc-mcp-{os.getpid()}.json"
+        self._remove_stale_configs()
+        _live_managers.add(self)
         self.windows_terminal_path: Optional[str] = None
+        # Terminal availability does not change within a session; keyed by
+        # force_powershell so toggling the preference does not rescan
+        self._terminal_cache: Dict[bool, str] = {}
+        self._which_cache: Dict[str, Optional[str]] = {}
+        # Last Claude CLI PID found; re-verified before a full process scan
+        self._claude_pid: Optional[int] = None
+
+    def _remove_stale_configs(self) -> None:
+        """Delete config files left behind by launcher processes that did not exit cleanly."""
+        cutoff = time.time() - STALE_CONFIG_SECONDS
+        try:
+            for path in self._config_path.parent.glob("cc-mcp-*.json"):
+                try:
+                    if path != self._config_path and path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        logger.debug("Removed stale MCP config: %s", path)
+                except OSError:
+                    continue
+        except OSError as exc:
+            logger.debug("Could not scan for stale MCP configs: %s", exc)
+
+    def _which(self, name: str) -> Optional[str]:
+        """shutil.which with misses remembered as well as hits."""
+        if name not in self._which_cache:
+            self._which_cache[name] = shutil.which(name)
+        return self._which_cache[name]
 
     def find_terminal(self, force_powershell: bool = False) -> str:
-        """Find an available terminal (cross-platform detection)."""
+        """Find an available terminal (cross-platform detection, cached)."""
+        terminal = self._terminal_cache.get(force_powershell)
+        if terminal is None:
+            terminal = self._detect_terminal(force_powershell)
+            self._terminal_cache[force_powershell] = terminal
+        return terminal
+
+    def _detect_terminal(self, force_powershell: bool) -> str:
+        """Detect an available terminal without consulting the cache."""
         logger.info("Detecting available terminal (platform=%s, force_powershell=%s)...", 
                     sys.platform, force_powershell)
 
-        if sys.platform == "win32":
-            if not force_powershell:
-                try:
-                    result = subprocess.run(
-                        ["cmd", "/c", "where", "wt"],
-                        capture_output=True,
-                        text=True,
-                        timeout=3,
-                    )
-                    if result.returncode == 0:
-                        wt_path = result.stdout.strip().splitlines()[0] if result.stdout else None
-                        if wt_path:
-                            self.windows_terminal_path = wt_path
-                        else:
-                            self.windows_terminal_path = self._resolve_windows_terminal_path()
-                        logger.info("Windows Terminal detected")
-                        return TerminalType.WINDOWS_TERMINAL
-                except (subprocess.TimeoutExpired, FileNotFoundError):
-                    logger.debug("Windows Terminal not found via `where wt`")
-
-                wt_path = self._resolve_windows_terminal_path()
-                if wt_path:
-                    logger.info("Windows Terminal detected at %s", wt_path)
-                    return TerminalType.WINDOWS_TERMINAL
-
-            if shutil.which("pwsh"):
-                logger.info("PowerShell 7 detected")
-                return TerminalType.POWERSHELL_7
-
-            if shutil.which("powershell"):
-                logger.info("PowerShell 5 detected")
-                return TerminalType.POWERSHELL_5
-
-            logger.info("Falling back to CMD")
-            return TerminalType.CMD
-
-        elif sys.platform == "darwin":
-            # macOS changed default shell from bash to zsh in Catalina (10.15)
-            if shutil.which("zsh"):
-                logger.info("zsh detected (macOS)")
-                return TerminalType.ZSH
-            elif shutil.which("bash"):
-                logger.info("bash detected (macOS)")
-                return TerminalType.BASH
-            elif shutil.which("sh"):
-                logger.info("sh detected (macOS)")
-                return TerminalType.SH
-            else:
-                logger.warning("No known shell found on macOS, defaulting to bash")
-                return TerminalType.BASH
-
-        elif sys.platform.startswith("linux") or sys.platform.startswith("freebsd"):
-            if shutil.which("bash"):
-                logger.info("bash detected (Linux)")
-                return TerminalType.BASH
-            elif shutil.which("zsh"):
-                logger.info("zsh detected (Linux)")
-                return TerminalType.ZSH
-            elif shutil.which("sh"):
-                logger.info("sh detected (Linux)")
-                return TerminalType.SH
-            else:
-                logger.warning("No known shell found on Linux, defaulting to bash")
-                return TerminalType.BASH
+        if _IS_WINDOWS and not force_powershell:
+            wt_path = self._resolve_windows_terminal_path()
+            if wt_path:
+                logger.info("Windows Terminal detected at %s", wt_path)
+                return TerminalType.WINDOWS_TERMINAL
 
-        else:
-            logger.warning("Unknown platform %s, defaulting to bash", sys.platform)
-            return TerminalType.BASH
+        for shell in _PLATFORM_SHELL_CANDIDATES:
+            if self._which(shell):
+                logger.info("%s detected", shell)
+                return shell
 
-    def _resolve_windows_terminal_path(self) -> Optional[str]:
-        """Resolve and cache the wt executable path if available."""
-        if self.windows_terminal_path:
-            cached_path = Path(self.windows_terminal_path)
-            if cached_path.exists():
-                return str(cached_path)
+        logger.warning("No known shell found (platform=%s), falling back to %s",
+                       sys.platform, _PLATFORM_FALLBACK_SHELL)
+        return _PLATFORM_FALLBACK_SHELL
 
-        wt_path = shutil.which("wt.exe") or shutil.which("wt")
+    def _resolve_windows_terminal_path(self) -> Optional[str]:
+        """Resolve the wt executable path if available (once per session via find_terminal)."""
+        # The Store install exposes wt.exe as an app execution alias here,
+        # which is cheaper to stat than scanning every PATH entry
+        local_app_data = os.environ.get("LOCALAPPDATA")
+        if local_app_data:
+            alias_path = Path(local_app_data) / "Microsoft" / "WindowsApps" / "wt.exe"
+            if alias_path.exists():
+                self.windows_terminal_path = str(alias_path)
+                return self.windows_terminal_path
+
+        wt_path = self._which("wt.exe") or self._which("wt")
         if wt_path:
             self.windows_terminal_path = wt_path
             return wt_path
@@ -133,64 +174,139 @@ class TerminalManager:
     @staticmethod
     def _build_powershell_command(project_path: str, claude_command: str) -> str:
         """Create a PowerShell command that sets the location then launches Claude Code."""
-        escaped_path = project_path.replace('"', '`"')
+        escaped_path = project_path.translate(_POWERSHELL_ESCAPE_TABLE)
         return f'Set-Location -LiteralPath "{escaped_path}"; & {claude_command}'
 
-    def check_powershell_version(self) -> Optional[str]:
-        """Check PowerShell version."""
+    @staticmethod
+    def _probe_powershell(executable: str) -> Optional[str]:
+        """Return the version reported by a PowerShell executable, if it runs."""
         try:
             result = subprocess.run(
-                ["pwsh", "-Command", "$PSVersionTable.PSVersion.ToString()"],
-                capture_output=True,
+                [executable, "-Command", "$PSVersionTable.PSVersion.ToString()"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=5,
+                timeout=POWERSHELL_PROBE_TIMEOUT,
+                **_SUBPROCESS_KWARGS,
             )
             if result.returncode == 0:
-                version = result.stdout.strip()
-                logger.info("PowerShell 7 version: %s", version)
-                return version
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+                return result.stdout.strip()
+        except subprocess.TimeoutExpired:
+            # A healthy install answers in well under a second
+            logger.warning("%s did not report its version within %ss", executable, POWERSHELL_PROBE_TIMEOUT)
+        except FileNotFoundError:
             pass
+        return None
 
+    def check_powershell_version(self) -> Optional[str]:
+        """Check PowerShell version (PowerShell 7 preferred over 5)."""
+        # Probe both at once so a missing pwsh does not delay the fallback
+        executor = ThreadPoolExecutor(max_workers=2)
         try:
-            result = subprocess.run(
-                ["powershell", "-Command", "$PSVersionTable.PSVersion.ToString()"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                logger.info("PowerShell 5 version: %s", version)
-                return version
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+            futures = {
+                executor.submit(self._probe_powershell, "pwsh"): TerminalType.POWERSHELL_7,
+                executor.submit(self._probe_powershell, "powershell"): TerminalType.POWERSHELL_5,
+            }
+            versions: Dict[str, Optional[str]] = {}
+            for future in as_completed(futures):
+                versions[futures[future]] = future.result()
+                if versions.get(TerminalType.POWERSHELL_7):
+                    break
+        finally:
+            executor.shutdown(wait=False)
+
+        if versions.get(TerminalType.POWERSHELL_7):
+            logger.info("PowerShell 7 version: %s", versions[TerminalType.POWERSHELL_7])
+            return versions[TerminalType.POWERSHELL_7]
+        if versions.get(TerminalType.POWERSHELL_5):
+            logger.info("PowerShell 5 version: %s", versions[TerminalType.POWERSHELL_5])
+            return versions[TerminalType.POWERSHELL_5]
 
         logger.warning("Could not detect PowerShell version")
         return None
 
+    @staticmethod
+    def _is_claude_candidate(process_name: str) -> bool:
+        """Cheap name filter applied before a process's cmdline is read."""
+        process_name = process_name.lower()
+        return "node" in process_name or "claude" in process_name
+
+    @staticmethod
+    def _is_claude_cmdline(cmdline) -> bool:
+        """Return True if any cmdline argument names the Claude CLI."""
+        for raw_arg in cmdline:
+            if raw_arg and _CLAUDE_CMDLINE_RE.search(str(raw_arg).lower().translate(_SLASH_TABLE)):
+                return True
+        return False
+
+    def _find_claude_pid_procfs(self) -> Optional[int]:
+        """Scan /proc directly (Linux): read comm for every PID, cmdline only for candidates."""
+        with os.scandir(_PROC_ROOT) as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f"{entry.path}/comm", "rb") as fh:
+                        comm = fh.read().decode("utf-8", "replace").strip()
+                    if not self._is_claude_candidate(comm):
+                        continue
+                    with open(f"{entry.path}/cmdline", "rb") as fh:
+                        cmdline = fh.read().decode("utf-8", "replace").split("\x00")
+                except OSError:
+                    # Process exited or belongs to another user
+                    continue
+                if self._is_claude_cmdline(cmdline):
+                    return int(entry.name)
+        return None
+
+    def _claude_pid_still_running(self, pid: int) -> bool:
+        """Re-check a previously found PID; matching the cmdline again guards against PID reuse."""
+        try:
+            if _USE_PROCFS:
+                with open(f"{_PROC_ROOT}/{pid}/cmdline", "rb") as fh:
+                    cmdline = fh.read().decode("utf-8", "replace").split("\x00")
+            else:
+                import psutil
+                cmdline = psutil.Process(pid).cmdline()
+        except Exception:
+            return False
+        return self._is_claude_cmdline(cmdline)
+
     def check_claude_code_running(self) -> Optional[int]:
         """Check if Claude Code is currently running."""
+        if self._claude_pid is not None:
+            if self._claude_pid_still_running(self._claude_pid):
+                return self._claude_pid
+            self._claude_pid = None
+
+        pid = self._scan_for_claude_pid()
+        if pid is not None:
+            logger.info("Claude CLI process found: PID %s", pid)
+        self._claude_pid = pid
+        return pid
+
+    def _scan_for_claude_pid(self) -> Optional[int]:
+        """Walk the process table for the Claude CLI."""
+        if _USE_PROCFS:
+            try:
+                return self._find_claude_pid_procfs()
+            except Exception as exc:
+                logger.error("Error checking for Claude Code process: %s", exc)
+                return None
+
+        # Imported on first use: psutil is only needed for this explicit
+        # action and is comparatively slow to import on Windows
+        import psutil
+
         try:
-            for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+            # Only name is prefetched; reading cmdline is comparatively costly,
+            # so do it just for candidates
+            for proc in psutil.process_iter(["pid", "name"]):
                 try:
-                    process_name = (proc.info["name"] or "").lower()
-                    if process_name and ("node" in process_name or "claude" in process_name):
-                        cmdline = proc.info.get("cmdline") or []
-                        for raw_arg in cmdline:
-                            if not raw_arg:
-                                continue
-                            arg = str(raw_arg).lower()
-                            normalized = arg.replace("\\", "/")
-                            if (
-                                "claude-code" in normalized
-                                or normalized.endswith("/claude")
-                                or normalized.endswith("/claude.exe")
-                                or normalized == "claude"
-                            ):
-                                pid = proc.info["pid"]
-                                logger.info("Claude CLI process found: PID %s", pid)
-                                return pid
+                    if (self._is_claude_candidate(proc.info["name"] or "")
+                            and self._is_claude_cmdline(proc.cmdline() or [])):
+                        return proc.info["pid"]
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     continue
         except Exception as exc:
@@ -199,6 +315,8 @@ class TerminalManager:
 
     def kill_claude_code(self, pid: Optional[int] = None) -> bool:
         """Terminate Claude Code process."""
+        import psutil
+
         target_pid = pid or self.check_claude_code_running()
         if target_pid is None:
             logger.info("No Claude Code process to kill")
@@ -237,13 +355,17 @@ class TerminalManager:
         if not servers:
             raise ValueError("No servers provided for MCP config generation")
 
-        mcp_servers: Dict[str, Dict] = {}
-        for server_id, server in servers.items():
-            if not server.enabled:
-                continue
+        enabled_servers = [(server_id, server) for server_id, server in servers.items() if server.enabled]
+        if not enabled_servers:
+            raise ValueError("No enabled servers available for MCP config generation")
 
+        mcp_servers: Dict[str, Dict] = {}
+        for server_id, server in enabled_servers:
             if server.type == "stdio":
-                args = expand_env_vars_in_list(server.args or [], project_path)
+                args = list(server.args or [])
+                # Literal args (no $VAR/%VAR% sigils) expand to themselves
+                if any("$" in arg or "%" in arg for arg in args):
+                    args = expand_env_vars_in_list(args, project_path)
                 entry = {
                     "type": "stdio",
                     "command": server.command,
@@ -267,20 +389,32 @@ class TerminalManager:
             raise ValueError("No enabled servers available for MCP config generation")
 
         config = {"mcpServers": mcp_servers}
+        # Read by the Claude CLI, not people: no pretty-printing
+        payload = json_io.dumps(config)
+        config_hash = hashlib.blake2b(payload, digest_size=16).digest()
 
-        temp_dir = Path(tempfile.gettempdir())
-        temp_dir.mkdir(parents=True, exist_ok=True)
-
-        if self.temp_config_path and self.temp_config_path.exists():
-            config_path = self.temp_config_path
-        else:
-            config_path = temp_dir / f"cc-mcp-{uuid.uuid4().hex[:8]}.json"
+        config_path = self._config_path
+        if _config_hashes.get(config_path) == config_hash:
+            try:
+                # Refresh the mtime so another launcher's stale-file sweep
+                # does not remove a config this process still hands out
+                os.utime(config_path)
+                logger.debug("MCP config unchanged: %s", config_path)
+                self.temp_config_path = config_path
+                return config_path
+            except OSError:
+                # Removed externally; write it again below
+                pass
 
         try:
-            with config_path.open("w", encoding="utf-8") as fh:
-                json.dump(config, fh, indent=2)
+            # Replace rather than rewrite in place so a claude process started
+            # from an earlier command never reads a half-written file
+            temp_path = config_path.with_suffix(".json.tmp")
+            temp_path.write_bytes(payload)
+            os.replace(temp_path, config_path)
             logger.info("MCP config generated: %s", config_path)
             self.temp_config_path = config_path
+            _config_hashes[config_path] = config_hash
             return config_path
         except Exception as exc:
             logger.error("Failed to write MCP config file: %s", exc)
@@ -289,23 +423,26 @@ class TerminalManager:
     @staticmethod
     def _escape_for_powershell(value: str) -> str:
         """Escape a string for inclusion inside PowerShell double quotes."""
-        return value.replace('"', '`"')
+        return value.translate(_POWERSHELL_ESCAPE_TABLE)
 
     @staticmethod
     def _escape_for_bash(value: str) -> str:
         """Escape string for bash/zsh double quotes: $ ` " \ and newlines."""
-        value = value.replace('\\', '\\\\')
-        value = value.replace('"', '\\"')
-        value = value.replace('$', '\\$')
-        value = value.replace('`', '\\`')
-        return value
+        return value.translate(_BASH_ESCAPE_TABLE)
 
     def get_launch_command(
         self,
         servers: Dict[str, MCPServer],
         project_path: str,
+        executor: Optional[ThreadPoolExecutor] = None,
     ) -> Tuple[bool, str]:
-        """Generate a shell command to launch Claude Code (cross-platform)."""
+        """
+        Generate a shell command to launch Claude Code (cross-platform).
+
+        When the terminal has not been detected yet, detection runs on
+        ``executor`` (or a one-off worker thread) while the MCP config is
+        written.
+        """
         project_dir = Path(project_path)
 
         if not project_dir.exists():
@@ -318,14 +455,22 @@ class TerminalManager:
         if not enabled_servers:
             return False, "Please enable at least one MCP server to build a launch command"
 
+        # Detect terminal type (to generate platform-appropriate syntax)
+        # alongside config generation; neither depends on the other
+        terminal_future = None
+        if False not in self._terminal_cache:
+            pool = executor or ThreadPoolExecutor(max_workers=1)
+            terminal_future = pool.submit(self.find_terminal)
+            if executor is None:
+                pool.shutdown(wait=False)
+
         try:
             config_path = self.generate_mcp_config(enabled_servers, project_path)
         except Exception as exc:
             logger.error("Failed to prepare MCP configuration: %s", exc)
             return False, str(exc)
 
-        # Detect terminal type to generate platform-appropriate command
-        terminal_type = self.find_terminal()
+        terminal_type = terminal_future.result() if terminal_future else self.find_terminal()
 
         # Generate command based on platform
         if terminal_type in (TerminalType.POWERSHELL_7, TerminalType.POWERSHELL_5, 
@@ -366,9 +511,10 @@ class TerminalManager:
             return True
 
         try:
-            if self.temp_config_path.exists():
-                self.temp_config_path.unlink()
-                logger.info("Temp config deleted: %s", self.temp_config_path)
+            # One syscall; a file already removed externally is not an error
+            self.temp_config_path.unlink(missing_ok=True)
+            logger.info("Temp config deleted: %s", self.temp_config_path)
+            _config_hashes.pop(self.temp_config_path, None)
             self.temp_config_path = None
             return True
         except PermissionError:
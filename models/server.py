@@ -13,6 +13,7 @@ class ValidationStatus:
     npm_version: Optional[str] = None
     locally_installed: Optional[bool] = None
     local_version: Optional[str] = None
+    endpoint_reachable: Optional[bool] = None  # HTTP servers only
     last_checked: Optional[datetime] = None
     error_message: Optional[str] = None
     cached: bool = False  # Whether this is cached data
@@ -24,6 +25,7 @@ class ValidationStatus:
             "npm_version": self.npm_version,
             "locally_installed": self.locally_installed,
             "local_version": self.local_version,
+            "endpoint_reachable": self.endpoint_reachable,
             "last_checked": self.last_checked.isoformat() if self.last_checked else None,
             "error_message": self.error_message,
             "cached": self.cached
@@ -44,13 +46,14 @@ class ValidationStatus:
             npm_version=data.get("npm_version"),
             locally_installed=data.get("locally_installed"),
             local_version=data.get("local_version"),
+            endpoint_reachable=data.get("endpoint_reachable"),
             last_checked=last_checked,
             error_message=data.get("error_message"),
             cached=data.get("cached", False)
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPServer:
     """MCP Server configuration."""
 
@@ -96,15 +99,24 @@ class MCPServer:
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> "MCPServer":
-        """Create from dictionary loaded from JSON."""
+    def from_dict(
+        cls,
+        data: dict,
+        default_id: Optional[str] = None,
+        default_type: Optional[str] = None
+    ) -> "MCPServer":
+        """Create from dictionary loaded from JSON.
+
+        default_id/default_type are used when the entry has no (or an empty)
+        "id"/"type", so callers need not copy the dict to fill them in.
+        """
         validation = None
         if data.get("validation"):
             validation = ValidationStatus.from_dict(data["validation"])
 
         return cls(
-            id=data["id"],
-            type=data["type"],
+            id=(data.get("id") or default_id) if default_id is not None else data["id"],
+            type=(data.get("type") or default_type) if default_type is not None else data["type"],
             enabled=data.get("enabled", True),
             is_template=data.get("is_template", False),
             order=data.get("order", 0),
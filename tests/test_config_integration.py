@@ -143,8 +143,11 @@ class TestConfigIntegration:
 
         config_manager.save(prefs, servers, profiles)
 
-        # Save again to create backup (backup only created when config already exists)
-        config_manager.save(prefs, servers, profiles)
+        # Save a change to create backup (backup only created when config already
+        # exists and is about to be replaced)
+        changed_servers = dict(servers)
+        changed_servers["extra"] = MCPServer(id="extra", type="stdio", command="cmd", args=[])
+        config_manager.save(prefs, changed_servers, profiles)
 
         # Verify backup exists now
         assert config_manager.backup_file.exists()
@@ -279,13 +282,11 @@ class TestConfigIntegration:
         # Create new instance to test rollback
         config_manager2 = ConfigManager()
 
-        # Patch save to fail
-        original_save = config_manager2.save
-
-        def failing_save(*args, **kwargs):
+        # Make the write itself fail
+        def failing_write(payload):
             raise IOError("Simulated disk full error")
 
-        monkeypatch.setattr(config_manager2, "save", failing_save)
+        monkeypatch.setattr(config_manager2, "_write_atomic", failing_write)
 
         # Try to save new config with rollback
         new_prefs = Preferences(theme="dark", default_path="C:\\New")
@@ -2,6 +2,7 @@
 
 import pytest
 import json
+import os
 import time
 from pathlib import Path
 from datetime import datetime
@@ -90,21 +91,79 @@ class TestConfigManagerLock:
         config_manager._release_lock()
 
     def test_release_lock(self, config_manager):
-        """Test lock release."""
+        """Test lock release allows another manager to acquire it."""
+        import core.config_manager
+        other = core.config_manager.ConfigManager()
+
         config_manager._acquire_lock()
         config_manager._release_lock()
-        assert not config_manager.lock_file.exists()
+
+        assert other._acquire_lock(timeout=0.2)
+        other._release_lock()
 
     def test_lock_timeout(self, config_manager):
-        """Test lock timeout when file is locked."""
-        # Create lock file manually
-        config_manager.lock_file.touch()
+        """Test lock timeout when file is locked by another holder."""
+        import core.config_manager
+        other = core.config_manager.ConfigManager()
+        assert other._acquire_lock()
 
         # Try to acquire with short timeout
         assert not config_manager._acquire_lock(timeout=0.2)
 
         # Cleanup
-        config_manager.lock_file.unlink()
+        other._release_lock()
+
+    def test_stale_lock_file_does_not_block(self, config_manager):
+        """A leftover lock file without a holder must not block acquisition."""
+        config_manager.lock_file.touch()
+
+        assert config_manager._acquire_lock(timeout=0.2)
+        config_manager._release_lock()
+
+    def test_lock_excludes_threads_of_same_manager(self, config_manager):
+        """Test a second thread using the same manager waits for the holder."""
+        import threading
+        results = []
+
+        assert config_manager._acquire_lock()
+        worker = threading.Thread(target=lambda: results.append(config_manager._acquire_lock(timeout=0.2)))
+        worker.start()
+        worker.join()
+        config_manager._release_lock()
+
+        assert results == [False]
+        assert config_manager._acquire_lock(timeout=0.2)
+        config_manager._release_lock()
+
+    def test_lock_file_closed_after_release(self, config_manager):
+        """Test the lock file descriptor does not outlive the lock."""
+        config_manager._acquire_lock()
+        fd = config_manager._lock_fd
+        config_manager._release_lock()
+
+        assert config_manager._lock_fd is None
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
+
+class TestConfigManagerPaths:
+    """Tests for project path normalization."""
+
+    def test_normalize_absolute_path_is_cached(self, config_manager, tmp_path):
+        """Resolving the same absolute path twice hits the cache."""
+        import core.config_manager
+        core.config_manager._resolve_cached.cache_clear()
+
+        first = config_manager.normalize_project_path(str(tmp_path))
+        second = config_manager.normalize_project_path(str(tmp_path))
+
+        assert first == second == str(tmp_path.resolve())
+        assert core.config_manager._resolve_cached.cache_info().hits == 1
+
+    def test_normalize_empty_path(self, config_manager):
+        """Empty paths normalize to None."""
+        assert config_manager.normalize_project_path("") is None
+        assert config_manager.normalize_project_path(None) is None
 
 
 class TestConfigManagerLoad:
@@ -230,6 +289,47 @@ class TestConfigManagerLoad:
             assert template_id in servers
 
 
+    def test_load_persists_migrated_version(self, config_manager):
+        """Loading an older config writes the migrated version back once."""
+        config_data = {
+            "version": "0.9.0",
+            "preferences": Preferences().to_dict(),
+            "servers": {},
+            "profiles": {}
+        }
+
+        with open(config_manager.config_file, 'w') as f:
+            json.dump(config_data, f)
+
+        config_manager.load()
+
+        with open(config_manager.config_file, 'r') as f:
+            data = json.load(f)
+        assert data["version"] == CONFIG_VERSION
+        assert data["project_profiles"] == {}
+
+    def test_load_current_version_does_not_rewrite(self, config_manager):
+        """Loading an up-to-date config leaves the file untouched."""
+        config_manager.load()
+        mtime_before = config_manager.config_file.stat().st_mtime_ns
+        time.sleep(0.01)
+
+        config_manager.load()
+
+        assert config_manager.config_file.stat().st_mtime_ns == mtime_before
+
+    def test_unchanged_save_keeps_backup(self, config_manager):
+        """An unchanged save leaves the previous version in the backup untouched."""
+        config_manager.save(Preferences(theme="light"), {}, {})
+        config_manager.save(Preferences(theme="dark"), {}, {})
+        backup_before = config_manager.backup_file.read_bytes()
+
+        config_manager.save(Preferences(theme="dark"), {}, {})
+
+        assert config_manager.backup_file.read_bytes() == backup_before
+        assert json.loads(backup_before)["preferences"]["theme"] == "light"
+
+
 class TestConfigManagerSave:
     """Tests for configuration saving."""
 
@@ -255,6 +355,17 @@ class TestConfigManagerSave:
 
         assert config_manager.backup_file.exists()
 
+    def test_backup_holds_previous_version(self, config_manager):
+        """Backup keeps the pre-save content and is independent of the config."""
+        config_manager.save(Preferences(theme="light"), {}, {})
+        config_manager.save(Preferences(theme="dark"), {}, {})
+
+        with open(config_manager.backup_file, 'r') as f:
+            assert json.load(f)["preferences"]["theme"] == "light"
+        with open(config_manager.config_file, 'r') as f:
+            assert json.load(f)["preferences"]["theme"] == "dark"
+        assert not config_manager.backup_file.samefile(config_manager.config_file)
+
     def test_save_atomic_write(self, config_manager):
         """Test save uses atomic write with temp file."""
         prefs = Preferences()
@@ -277,6 +388,64 @@ class TestConfigManagerSave:
         assert data["version"] == CONFIG_VERSION
         assert "test" in data["servers"]
 
+    def test_save_fsyncs_and_leaves_no_temp_file(self, config_manager, monkeypatch):
+        """Test save fsyncs the temp file and cleans up after rename."""
+        import os
+        fsynced = []
+        real_fsync = os.fsync
+
+        def tracking_fsync(fd):
+            fsynced.append(fd)
+            real_fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", tracking_fsync)
+
+        config_manager.save(Preferences(), {}, {})
+
+        assert fsynced
+        assert config_manager.config_file.exists()
+        assert not config_manager.config_file.with_suffix('.tmp').exists()
+
+    def test_save_skips_unchanged_content(self, config_manager):
+        """Saving identical content twice should not rewrite the file."""
+        prefs = Preferences(theme="light")
+        config_manager.save(prefs, {}, {})
+        mtime_before = config_manager.config_file.stat().st_mtime_ns
+        time.sleep(0.01)
+
+        config_manager.save(prefs, {}, {})
+
+        assert config_manager.config_file.stat().st_mtime_ns == mtime_before
+
+    def test_save_rewrites_after_external_edit(self, config_manager):
+        """An external edit invalidates the unchanged-content shortcut."""
+        prefs = Preferences(theme="light")
+        config_manager.save(prefs, {}, {})
+
+        with open(config_manager.config_file, 'w') as f:
+            json.dump({"version": CONFIG_VERSION, "preferences": {"theme": "dark"}}, f)
+
+        config_manager.save(prefs, {}, {})
+
+        with open(config_manager.config_file, 'r') as f:
+            data = json.load(f)
+        assert data["preferences"]["theme"] == "light"
+
+    def test_save_rejects_non_json_values(self, config_manager):
+        """Values that to_dict() does not make JSON-native fail loudly."""
+        servers = {
+            "bad": MCPServer(
+                id="bad",
+                type="stdio",
+                command="cmd",
+                args=[],
+                env={"TOKEN": object()}
+            )
+        }
+
+        with pytest.raises(TypeError):
+            config_manager.save(Preferences(), servers, {})
+
     def test_save_preserves_data_integrity(self, config_manager):
         """Test save preserves all data correctly."""
         prefs = Preferences(
@@ -353,11 +522,11 @@ class TestConfigManagerRollback:
         prefs1 = Preferences(theme="light")
         config_manager.save(prefs1, {}, {})
 
-        # Patch save to fail
-        def failing_save(*args, **kwargs):
+        # Make the write itself fail
+        def failing_write(payload):
             raise IOError("Simulated write error")
 
-        monkeypatch.setattr(config_manager, "save", failing_save)
+        monkeypatch.setattr(config_manager, "_write_atomic", failing_write)
 
         # Try to save (should fail and rollback)
         prefs2 = Preferences(theme="dark")
@@ -371,6 +540,83 @@ class TestConfigManagerRollback:
         assert data["preferences"]["theme"] == "light"
 
 
+    def test_save_with_rollback_after_write_restores(self, config_manager, monkeypatch):
+        """A failure after the new file landed restores the snapshot."""
+        config_manager.save(Preferences(theme="light"), {}, {})
+
+        def failing_cleanup():
+            raise IOError("Simulated post-write failure")
+
+        monkeypatch.setattr(config_manager, "_cleanup_legacy_files", failing_cleanup)
+
+        result = config_manager.save_with_rollback(Preferences(theme="dark"), {}, {})
+
+        assert result is False
+        with open(config_manager.config_file, 'r') as f:
+            assert json.load(f)["preferences"]["theme"] == "light"
+        assert not list(config_manager.config_dir.glob("*.snapshot"))
+
+    def test_save_with_rollback_snapshot_copy_failure(self, config_manager, monkeypatch):
+        """A snapshot that cannot be taken aborts the save and returns False."""
+        config_manager.save(Preferences(theme="light"), {}, {})
+
+        def no_links(src, dst):
+            raise OSError("Hard links unsupported")
+
+        def failing_copy(src, dst):
+            raise OSError("Disk full")
+
+        monkeypatch.setattr("core.config_manager.os.link", no_links)
+        monkeypatch.setattr("core.config_manager.shutil.copyfile", failing_copy)
+
+        assert config_manager.save_with_rollback(Preferences(theme="dark"), {}, {}) is False
+        with open(config_manager.config_file, 'r') as f:
+            assert json.load(f)["preferences"]["theme"] == "light"
+
+    def test_save_with_rollback_restore_failure(self, config_manager, monkeypatch):
+        """A rollback that cannot restore the snapshot is logged and returns False."""
+        config_manager.save(Preferences(theme="light"), {}, {})
+
+        def failing_cleanup():
+            raise IOError("Simulated post-write failure")
+
+        real_replace = os.replace
+
+        def failing_replace(src, dst):
+            if str(src).endswith(".snapshot"):
+                raise OSError("Simulated rename failure")
+            real_replace(src, dst)
+
+        monkeypatch.setattr(config_manager, "_cleanup_legacy_files", failing_cleanup)
+        monkeypatch.setattr("core.config_manager.os.replace", failing_replace)
+
+        assert config_manager.save_with_rollback(Preferences(theme="dark"), {}, {}) is False
+        assert list(config_manager.config_dir.glob("*.snapshot"))
+
+
+class TestConfigManagerLegacyCleanup:
+    """Tests for removing legacy per-project profile files."""
+
+    def test_cleanup_removes_files_and_empty_dirs(self, config_manager, tmp_path):
+        """Legacy files are deleted; only directories left empty are removed."""
+        paths = []
+        for i in range(3):
+            legacy_dir = tmp_path / f"project_{i}" / ".cc-launcher"
+            legacy_dir.mkdir(parents=True)
+            legacy_file = legacy_dir / "profiles.json"
+            legacy_file.write_text("{}")
+            paths.append(legacy_file)
+        (paths[0].parent / "keep.txt").write_text("user data")
+
+        config_manager._legacy_cleanup_paths.update(paths)
+        config_manager._cleanup_legacy_files()
+
+        assert not any(path.exists() for path in paths)
+        assert paths[0].parent.exists()
+        assert not paths[1].parent.exists()
+        assert not config_manager._legacy_cleanup_paths
+
+
 class TestConfigManagerPresets:
     """Tests for preset templates."""
 
@@ -455,6 +701,23 @@ class TestConfigManagerValidation:
         assert any("servers" in e for e in errors)
         assert any("profiles" in e for e in errors)
 
+    def test_validate_nested_entries(self, config_manager):
+        """Nested server/profile entries must be mappings."""
+        config_data = {
+            "version": CONFIG_VERSION,
+            "preferences": {},
+            "servers": {"ok": {"id": "ok"}},
+            "profiles": {"p": {"id": "p"}},
+            "project_profiles": {"/proj": {"bad": "not-a-dict"}}
+        }
+
+        is_valid, errors = config_manager.validate_config(config_data)
+        assert is_valid is False
+        assert errors == ["Project profile bad in /proj must be a dictionary"]
+
+        config_data["project_profiles"] = {"/proj": {"good": {}}}
+        assert config_manager.validate_config(config_data) == (True, [])
+
     def test_validate_invalid_types(self, config_manager):
         """Test validation detects invalid types."""
         config_data = {
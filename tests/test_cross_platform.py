@@ -5,14 +5,25 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 import pytest
 
-from core.terminal_manager import TerminalManager, TerminalType
+from core.terminal_manager import TerminalManager, TerminalType, _platform_shells
 from utils.env_expander import expand_env_vars
 
 
+def platform_shells(platform):
+    """Patch terminal detection to behave as it does on ``platform``."""
+    candidates, fallback = _platform_shells(platform)
+    return patch.multiple(
+        "core.terminal_manager",
+        _IS_WINDOWS=platform == "win32",
+        _PLATFORM_SHELL_CANDIDATES=candidates,
+        _PLATFORM_FALLBACK_SHELL=fallback,
+    )
+
+
 class TestUnixShellDetection:
     """Tests for Unix shell detection."""
 
-    @patch('sys.platform', 'darwin')
+    @platform_shells('darwin')
     @patch('shutil.which')
     def test_macos_zsh_detection(self, mock_which):
         """Test zsh detection on macOS."""
@@ -23,7 +34,7 @@ class TestUnixShellDetection:
         
         assert result == TerminalType.ZSH
 
-    @patch('sys.platform', 'darwin')
+    @platform_shells('darwin')
     @patch('shutil.which')
     def test_macos_bash_fallback(self, mock_which):
         """Test bash fallback on macOS when zsh not available."""
@@ -34,7 +45,7 @@ class TestUnixShellDetection:
         
         assert result == TerminalType.BASH
 
-    @patch('sys.platform', 'linux')
+    @platform_shells('linux')
     @patch('shutil.which')
     def test_linux_bash_detection(self, mock_which):
         """Test bash detection on Linux."""
@@ -45,7 +56,7 @@ class TestUnixShellDetection:
         
         assert result == TerminalType.BASH
 
-    @patch('sys.platform', 'linux')
+    @platform_shells('linux')
     @patch('shutil.which')
     def test_linux_zsh_detection(self, mock_which):
         """Test zsh detection on Linux."""
@@ -121,7 +132,7 @@ class TestWindowsVariablesOnUnix:
 class TestCrossPlatformCommandGeneration:
     """Tests for cross-platform command generation."""
 
-    @patch('sys.platform', 'darwin')
+    @platform_shells('darwin')
     @patch('shutil.which')
     def test_macos_command_generation(self, mock_which, tmp_path):
         """Test command generation on macOS uses bash/zsh syntax."""
@@ -150,7 +161,7 @@ class TestCrossPlatformCommandGeneration:
         # Should NOT contain PowerShell syntax
         assert "Set-Location" not in command
 
-    @patch('sys.platform', 'win32')
+    @platform_shells('win32')
     @patch('subprocess.run')
     @patch('shutil.which')
     def test_windows_command_generation(self, mock_which, mock_run, tmp_path):
@@ -209,6 +220,12 @@ class TestBashEscaping:
         result = TerminalManager._escape_for_bash('path\\with\\backslashes')
         assert '\\\\' in result
 
+    def test_escape_mixed_characters(self):
+        """Test each special character is escaped exactly once."""
+        from core.terminal_manager import TerminalManager
+        result = TerminalManager._escape_for_bash('a\\b"c$d`e')
+        assert result == 'a\\\\b\\"c\\$d\\`e'
+
 
 class TestTempDirectoryCrossplatform:
     """Test that temp directory is cross-platform."""
@@ -0,0 +1,45 @@
+"""Unit tests for the file writing helpers."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from utils.file_io import atomic_write_bytes
+
+
+class TestAtomicWriteBytes:
+    """Tests for atomic_write_bytes."""
+
+    def test_replaces_file_contents(self, tmp_path):
+        """The target ends up with exactly the new bytes and no temp file remains."""
+        target = tmp_path / "data.json"
+        target.write_bytes(b"old contents that are longer")
+
+        atomic_write_bytes(target, b"new")
+
+        assert target.read_bytes() == b"new"
+        assert not (tmp_path / "data.json.tmp").exists()
+
+    def test_custom_temp_path(self, tmp_path):
+        """An explicit temp path is used instead of the default suffix."""
+        target = tmp_path / "data.json"
+        temp = tmp_path / "data.tmp"
+
+        with patch("utils.file_io.os.replace", wraps=os.replace) as mock_replace:
+            atomic_write_bytes(target, b"{}", temp)
+
+        mock_replace.assert_called_once_with(os.fspath(temp), os.fspath(target))
+        assert target.read_bytes() == b"{}"
+
+    def test_failed_replace_keeps_original(self, tmp_path):
+        """A failure before the rename leaves the old file and cleans up the temp file."""
+        target = tmp_path / "data.json"
+        target.write_bytes(b"original")
+
+        with patch("utils.file_io.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                atomic_write_bytes(target, b"new")
+
+        assert target.read_bytes() == b"original"
+        assert not (tmp_path / "data.json.tmp").exists()
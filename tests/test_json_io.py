@@ -0,0 +1,45 @@
+"""Unit tests for the JSON encoding helpers."""
+
+import json
+
+import pytest
+
+from utils import json_io
+
+
+class TestJsonIO:
+    """Tests for json_io loads/dumps."""
+
+    def test_dumps_returns_bytes(self):
+        """dumps should always return UTF-8 bytes."""
+        payload = json_io.dumps({"key": "value"})
+        assert isinstance(payload, bytes)
+        assert json.loads(payload) == {"key": "value"}
+
+    def test_dumps_indent_is_human_readable(self):
+        """indent=True should produce multi-line output."""
+        payload = json_io.dumps({"a": 1, "b": [1, 2]}, indent=True)
+        assert b"\n" in payload
+        assert json.loads(payload) == {"a": 1, "b": [1, 2]}
+
+    def test_roundtrip_non_ascii(self):
+        """Non-ASCII strings survive a dumps/loads roundtrip."""
+        data = {"path": "C:\\Users\\Jürgen\\项目"}
+        assert json_io.loads(json_io.dumps(data)) == data
+
+    def test_loads_accepts_str(self):
+        """loads accepts text as well as bytes."""
+        assert json_io.loads('{"x": true}') == {"x": True}
+
+    def test_default_callback(self):
+        """default is used for otherwise unserializable objects."""
+        class Custom:
+            def __str__(self):
+                return "custom"
+
+        assert json_io.loads(json_io.dumps({"v": Custom()}, default=str)) == {"v": "custom"}
+
+    def test_invalid_json_raises_decode_error(self):
+        """Malformed input raises json_io.JSONDecodeError."""
+        with pytest.raises(json_io.JSONDecodeError):
+            json_io.loads(b"{ invalid json }")
@@ -58,6 +58,7 @@ class TestValidationStatus:
         assert status.npm_version is None
         assert status.locally_installed is None
         assert status.local_version is None
+        assert status.endpoint_reachable is None
         assert status.last_checked is None
         assert status.error_message is None
         assert status.cached is False
@@ -199,6 +200,36 @@ class TestMCPServer:
         assert restored.env == server.env
 
 
+    def test_from_dict_defaults(self):
+        """Test default id/type fill in missing or empty fields."""
+        data = {"command": "npx", "args": ["-y", "pkg"], "type": ""}
+
+        restored = MCPServer.from_dict(data, default_id="fallback", default_type="stdio")
+
+        assert restored.id == "fallback"
+        assert restored.type == "stdio"
+        assert "id" not in data
+
+        explicit = MCPServer.from_dict(
+            {"id": "mine", "type": "http", "url": "https://example.com"},
+            default_id="fallback",
+            default_type="stdio"
+        )
+        assert explicit.id == "mine"
+        assert explicit.type == "http"
+
+    def test_uses_slots(self):
+        """Test servers are slotted and still copy/pickle cleanly."""
+        import copy
+        import pickle
+
+        server = MCPServer(id="test", type="stdio", command="npx", args=[])
+
+        assert not hasattr(server, "__dict__")
+        assert copy.deepcopy(server) == server
+        assert pickle.loads(pickle.dumps(server)) == server
+
+
 class TestProfile:
     """Tests for Profile model."""
 
@@ -248,5 +279,6 @@ class TestProfile:
         assert restored.created.isoformat() == profile.created.isoformat()
 
 
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
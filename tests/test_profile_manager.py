@@ -36,7 +36,10 @@ def config_manager(temp_config_dir, monkeypatch):
 @pytest.fixture
 def profile_manager(config_manager):
     """Create a ProfileManager with test ConfigManager."""
-    return ProfileManager(config_manager)
+    manager = ProfileManager(config_manager)
+    yield manager
+    # Write leftovers now so a debounce timer cannot fire into the next test
+    manager.flush()
 
 
 @pytest.fixture
@@ -137,6 +140,17 @@ class TestCreateProfile:
         assert "does not exist" in error
         assert profile is None
 
+    def test_create_profile_dedupes_server_ids(self, profile_manager, setup_config):
+        """Test duplicate server IDs are stored once, in first-seen order."""
+        success, _, profile = profile_manager.create_profile(
+            profile_id="dev",
+            name="Development",
+            server_ids=["ref", "filesystem", "ref"]
+        )
+
+        assert success is True
+        assert profile.servers == ["ref", "filesystem"]
+
     def test_create_profile_persists(self, profile_manager, setup_config):
         """Test created profile is saved to config."""
         profile_manager.create_profile(
@@ -459,6 +473,15 @@ class TestGetEnabledServers:
         enabled = profile_manager.get_enabled_servers()
         assert set(enabled) == {"ref", "supabase"}
 
+    def test_switch_result_does_not_alias_cache(self, profile_manager, setup_config):
+        """Test toggling returned servers leaves the enabled set unchanged."""
+        profile_manager.create_profile("dev", "Development", ["ref"])
+        _, _, _, servers = profile_manager.switch_profile("dev")
+
+        servers["filesystem"].enabled = True
+
+        assert profile_manager.get_enabled_servers() == ["ref"]
+
 
 class TestSaveCurrentState:
     """Test saving current state to profile."""
@@ -494,4 +517,208 @@ class TestSaveCurrentState:
         success, error = profile_manager.save_current_state_to_profile("nonexistent")
 
         assert success is False
-        assert "not found" in error
\ No newline at end of file
+        assert "not found" in error
+
+class TestConfigCache:
+    """Test the in-memory config cache."""
+
+    def test_repeated_reads_skip_disk(self, profile_manager, setup_config, monkeypatch):
+        """Test reads reuse the cached config while the file is unchanged."""
+        profile_manager.list_profiles()
+
+        calls = []
+        original_load = profile_manager.config_manager.load
+        monkeypatch.setattr(
+            profile_manager.config_manager,
+            "load",
+            lambda: calls.append(1) or original_load()
+        )
+
+        profile_manager.list_profiles()
+        profile_manager.get_profile("dev")
+        profile_manager.get_enabled_servers()
+
+        assert calls == []
+
+    def test_cache_refreshed_after_save(self, profile_manager, setup_config, monkeypatch):
+        """Test mutations keep the cache current without another load."""
+        profile_manager.create_profile(
+            profile_id="dev",
+            name="Development",
+            server_ids=["filesystem"]
+        )
+
+        monkeypatch.setattr(
+            profile_manager.config_manager,
+            "load",
+            lambda: pytest.fail("unexpected load")
+        )
+
+        assert profile_manager.get_profile("dev").name == "Development"
+
+    def test_read_results_do_not_alias_cache(self, profile_manager, setup_config):
+        """Test mutating returned profiles leaves the cached state untouched."""
+        profile_manager.create_profile("dev", "Development", ["filesystem"])
+
+        profile_manager.get_profile("dev").name = "Changed"
+        profile_manager.list_profiles()["dev"].servers.append("ref")
+        del profile_manager.get_all_profiles()["dev"]
+
+        profile = profile_manager.get_profile("dev")
+        assert profile.name == "Development"
+        assert profile.servers == ["filesystem"]
+
+    def test_external_save_invalidates_cache(self, profile_manager, setup_config):
+        """Test saves made outside the manager are picked up."""
+        assert profile_manager.get_enabled_servers() == ["filesystem"]
+
+        preferences, servers, profiles = profile_manager.config_manager.load()
+        servers["ref"].enabled = True
+        profile_manager.config_manager.save(preferences, servers, profiles)
+
+        assert profile_manager.get_enabled_servers() == ["filesystem", "ref"]
+
+
+class TestDeferredSave:
+    """Test coalescing of profile writes."""
+
+    def test_edits_coalesce_into_one_save(self, profile_manager, setup_config, monkeypatch):
+        """Test a burst of edits is written with a single save."""
+        profile_manager.list_profiles()
+
+        saves = []
+        original_save = profile_manager.config_manager.save
+        monkeypatch.setattr(
+            profile_manager.config_manager,
+            "save",
+            lambda *args: saves.append(1) or original_save(*args)
+        )
+
+        profile_manager.create_profile("dev", "Development", ["filesystem"])
+        profile_manager.update_profile("dev", name="Dev")
+        profile_manager.switch_profile("dev")
+        assert saves == []
+
+        profile_manager.flush()
+        assert saves == [1]
+
+        _, _, profiles = profile_manager.config_manager.load()
+        assert profiles["dev"].name == "Dev"
+
+    def test_pending_edits_saved_after_delay(self, profile_manager, setup_config, monkeypatch):
+        """Test the debounce timer writes pending edits on its own."""
+        import core.profile_manager as pm_module
+        monkeypatch.setattr(pm_module, "SAVE_DEBOUNCE_SECONDS", 0.01)
+
+        profile_manager.create_profile("dev", "Development", ["filesystem"])
+        timer = profile_manager._flush_timer
+        timer.join(timeout=2)
+
+        _, _, profiles = profile_manager.config_manager.load()
+        assert "dev" in profiles
+
+    def test_external_save_merged_with_pending_edits(self, profile_manager, setup_config):
+        """Test a save made elsewhere keeps both its changes and the pending edits."""
+        profile_manager.create_profile("dev", "Development", ["ref"])
+        profile_manager.switch_profile("dev")
+
+        # Another launcher process: no flush hook for our pending edits
+        other = ConfigManager()
+        preferences, servers, profiles = other.load()
+        preferences.theme = "light"
+        servers["supabase"].enabled = True
+        other.save(preferences, servers, profiles)
+
+        assert profile_manager.flush() == (True, None)
+
+        preferences, servers, profiles = profile_manager.config_manager.load()
+        assert preferences.theme == "light"
+        assert preferences.last_profile == "dev"
+        assert profiles["dev"].servers == ["ref"]
+        # Replaying the switch does not overwrite server toggles saved elsewhere
+        assert servers["supabase"].enabled and servers["filesystem"].enabled
+
+    def test_reads_after_external_save_include_pending_edits(self, profile_manager, setup_config):
+        """Test re-reading a changed file reapplies edits not yet written."""
+        profile_manager.create_profile("dev", "Development", ["ref"])
+        profile_manager.switch_profile("dev")
+
+        other = ConfigManager()
+        other.save(*other.load())
+
+        assert "dev" in profile_manager.list_profiles()
+        assert profile_manager.get_profile("dev").last_used is not None
+
+    def test_pending_edits_flushed_before_direct_save(self, profile_manager, setup_config):
+        """Test saving through the shared ConfigManager writes pending edits first."""
+        profile_manager.create_profile("dev", "Development", ["ref"])
+        profile_manager.switch_profile("dev")
+
+        # What MainWindow._persist_config does after the user toggles a server
+        preferences, servers, profiles = profile_manager.config_manager.load()
+        assert preferences.last_profile == "dev"
+        servers["supabase"].enabled = True
+        profile_manager.config_manager.save(preferences, servers, profiles)
+
+        assert profile_manager.flush() == (True, None)
+        _, servers, _ = profile_manager.config_manager.load()
+        assert servers["supabase"].enabled and servers["ref"].enabled
+
+    def test_failed_save_reported_and_retried(self, profile_manager, setup_config, monkeypatch):
+        """Test a failed save keeps the edits and fails later operations until it succeeds."""
+        profile_manager.list_profiles()
+        original_save = profile_manager.config_manager.save
+
+        def fail(*args):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(profile_manager.config_manager, "save", fail)
+        profile_manager.create_profile("dev", "Development", ["filesystem"])
+
+        success, error = profile_manager.flush()
+        assert success is False
+        assert "disk full" in error
+
+        success, error, _ = profile_manager.create_profile("qa", "QA", [])
+        assert success is False
+        assert "disk full" in error
+
+        monkeypatch.setattr(profile_manager.config_manager, "save", original_save)
+        success, _, _ = profile_manager.create_profile("qa", "QA", [])
+        assert success is True
+
+        _, _, profiles = profile_manager.config_manager.load()
+        assert {"dev", "qa"} <= set(profiles)
+
+    def test_exit_flush_does_not_keep_manager_alive(self, config_manager):
+        """Test the exit hook holds managers weakly."""
+        import gc
+        import weakref
+
+        manager = ProfileManager(config_manager)
+        ref = weakref.ref(manager)
+        del manager
+        gc.collect()
+
+        assert ref() is None
+
+
+class TestLoadFailure:
+    """Test read and write paths when the config cannot be loaded."""
+
+    def test_reads_fall_back_to_empty(self, profile_manager, monkeypatch):
+        """Test read methods return empty results instead of raising."""
+        def fail():
+            raise RuntimeError("locked")
+
+        monkeypatch.setattr(profile_manager.config_manager, "load", fail)
+
+        assert profile_manager.get_profile("dev") is None
+        assert profile_manager.list_profiles() == {}
+        assert profile_manager.get_enabled_servers() == []
+        assert profile_manager.get_all_profiles() == {}
+
+        success, error, profile = profile_manager.create_profile("dev", "Dev", [])
+        assert success is False
+        assert "Failed to load" in error
+
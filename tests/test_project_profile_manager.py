@@ -77,3 +77,174 @@ def test_import_legacy_project_profiles_promotes_to_global(config_env, tmp_path)
     _, _, profiles = manager.load()
     assert "legacy" in profiles
     assert profiles["legacy"].scope == "global"
+
+
+def test_project_profiles_round_trip(tmp_path):
+    from core.project_profile_manager import ProjectProfileManager
+
+    project_path = str(tmp_path)
+    profile = Profile(
+        id="local",
+        name="Local",
+        servers=["filesystem"],
+        created=datetime.now(),
+        modified=datetime.now(),
+        scope="project",
+    )
+
+    success, error = ProjectProfileManager.save_project_profiles(project_path, {"local": profile})
+    assert success is True
+    assert error is None
+
+    profiles = ProjectProfileManager.load_project_profiles(project_path)
+    assert list(profiles) == ["local"]
+    assert profiles["local"].project_path == project_path
+
+
+def test_project_paths_are_memoized(tmp_path):
+    from core import project_profile_manager as ppm
+
+    project_path = str(tmp_path)
+    ppm.ProjectProfileManager.clear_cache()
+
+    first = ppm.ProjectProfileManager.get_project_profiles_file(project_path)
+    assert project_path in ppm._project_path_cache
+    assert ppm.ProjectProfileManager.get_project_profiles_file(project_path) is first
+
+    ppm.ProjectProfileManager.clear_cache(project_path)
+    assert project_path not in ppm._project_path_cache
+    assert ppm.ProjectProfileManager.get_project_config_path(str(tmp_path / "missing")) is None
+
+
+def test_project_caches_are_bounded(tmp_path, monkeypatch):
+    from core import project_profile_manager as ppm
+
+    monkeypatch.setattr(ppm, "MAX_CACHED_PROJECTS", 2)
+    ppm.ProjectProfileManager.clear_cache()
+    now = datetime.now()
+    projects = []
+    for name in ("a", "b", "c"):
+        project_dir = tmp_path / name
+        project_dir.mkdir()
+        profile = Profile(id=name, name=name, servers=[], created=now, modified=now, scope="project")
+        ppm.ProjectProfileManager.save_project_profiles(str(project_dir), {name: profile})
+        ppm.ProjectProfileManager.load_project_profiles(str(project_dir))
+        projects.append(str(project_dir))
+
+    assert list(ppm._project_path_cache) == projects[1:]
+    assert len(ppm._raw_cache) == 2
+    assert list(ppm.ProjectProfileManager.load_project_profiles(projects[0])) == ["a"]
+
+
+def test_delete_project_profile(tmp_path):
+    from core.project_profile_manager import ProjectProfileManager
+
+    project_path = str(tmp_path)
+    now = datetime.now()
+    profiles = {
+        pid: Profile(id=pid, name=pid, servers=[], created=now, modified=now, scope="project")
+        for pid in ("keep", "drop")
+    }
+    ProjectProfileManager.save_project_profiles(project_path, profiles)
+
+    assert ProjectProfileManager.delete_project_profile(project_path, "drop") == (True, None)
+    assert list(ProjectProfileManager.load_project_profiles(project_path)) == ["keep"]
+
+    success, error = ProjectProfileManager.delete_project_profile(project_path, "drop")
+    assert success is False
+    assert "not found" in error
+
+
+def test_deleting_last_project_profile_removes_file(tmp_path):
+    from core.project_profile_manager import ProjectProfileManager
+
+    project_path = str(tmp_path)
+    now = datetime.now()
+    profile = Profile(id="only", name="Only", servers=[], created=now, modified=now, scope="project")
+    ProjectProfileManager.save_project_profiles(project_path, {"only": profile})
+    profiles_file = ProjectProfileManager.get_project_profiles_file(project_path)
+
+    assert ProjectProfileManager.delete_project_profile(project_path, "only") == (True, None)
+    assert not profiles_file.exists()
+    assert ProjectProfileManager.load_project_profiles(project_path) == {}
+
+
+def test_project_profiles_load_lazily(tmp_path):
+    from core.project_profile_manager import LazyProfiles, ProjectProfileManager
+
+    project_path = str(tmp_path)
+    now = datetime.now()
+    profiles = {
+        pid: Profile(id=pid, name=pid, servers=[], created=now, modified=now, scope="project")
+        for pid in ("one", "two")
+    }
+    ProjectProfileManager.save_project_profiles(project_path, profiles)
+
+    loaded = ProjectProfileManager.load_project_profiles(project_path)
+    assert isinstance(loaded, LazyProfiles)
+    assert loaded._profiles == {}
+
+    loaded["one"].name = "Renamed"
+    assert list(loaded._profiles) == ["one"]
+
+    ProjectProfileManager.save_project_profiles(project_path, loaded)
+    reloaded = ProjectProfileManager.load_project_profiles(project_path)
+    assert list(reloaded) == ["one", "two"]
+    assert reloaded["one"].name == "Renamed"
+    assert reloaded["two"].scope == "project"
+
+
+def test_malformed_project_profile_skipped(tmp_path):
+    from core.project_profile_manager import ProjectProfileManager
+
+    project_path = str(tmp_path)
+    now = datetime.now()
+    good = Profile(id="good", name="Good", servers=[], created=now, modified=now, scope="project")
+    ProjectProfileManager.save_project_profiles(project_path, {"good": good})
+
+    profiles_file = ProjectProfileManager.get_project_profiles_file(project_path)
+    data = json.loads(profiles_file.read_text())
+    data["bad"] = {**data["good"], "id": "bad", "created": "not a date"}
+    profiles_file.write_text(json.dumps(data))
+
+    loaded = ProjectProfileManager.load_project_profiles(project_path)
+
+    assert len(loaded) == 1
+    assert [profile.id for profile in loaded.values()] == ["good"]
+
+
+def test_separate_loads_do_not_share_profiles(tmp_path):
+    from core.project_profile_manager import ProjectProfileManager
+
+    project_path = str(tmp_path)
+    now = datetime.now()
+    profile = Profile(id="one", name="One", servers=["a"], created=now, modified=now, scope="project")
+    ProjectProfileManager.save_project_profiles(project_path, {"one": profile})
+
+    first = ProjectProfileManager.load_project_profiles(project_path)["one"]
+    first.name = "Unsaved edit"
+    first.servers.append("b")
+    second = ProjectProfileManager.load_project_profiles(project_path)["one"]
+
+    assert second is not first
+    assert second.name == "One"
+    assert second.servers == ["a"]
+
+
+def test_saving_no_project_profiles_removes_file(tmp_path):
+    from core.project_profile_manager import ProjectProfileManager
+
+    project_path = str(tmp_path)
+    now = datetime.now()
+    profile = Profile(id="one", name="One", servers=[], created=now, modified=now, scope="project")
+
+    assert ProjectProfileManager.save_project_profiles(project_path, {}) == (True, None)
+    assert not (tmp_path / ".cc-launcher").exists()
+
+    ProjectProfileManager.save_project_profiles(project_path, {"one": profile})
+    profiles_file = ProjectProfileManager.get_project_profiles_file(project_path)
+    assert profiles_file.exists()
+
+    assert ProjectProfileManager.save_project_profiles(project_path, {}) == (True, None)
+    assert not profiles_file.exists()
+    assert ProjectProfileManager.load_project_profiles(project_path) == {}
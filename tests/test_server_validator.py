@@ -3,11 +3,12 @@
 import pytest
 import asyncio
 import json
+import os
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock, patch, AsyncMock
 
-from core.server_validator import ServerValidator
+from core.server_validator import ServerValidator, _extract_pkg
 from models.server import MCPServer, ValidationStatus
 
 
@@ -158,6 +159,17 @@ class TestExtractPackageName:
         package = validator.extract_package_name(http_server)
         assert package is None
 
+    def test_extract_memoized_per_args(self, temp_cache_dir, stdio_server):
+        """Test servers with the same args reuse one parse"""
+        _extract_pkg.cache_clear()
+        validator = ServerValidator()
+
+        validator.extract_package_name(stdio_server)
+        validator.extract_package_name(stdio_server)
+
+        info = _extract_pkg.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
 
 class TestCacheValidation:
     """Test cache validation logic"""
@@ -187,6 +199,26 @@ class TestCacheValidation:
         }
         assert validator._is_cache_valid(cache_entry) == False
 
+    def test_is_cache_valid_uses_reference_time(self, temp_cache_dir):
+        """Test expiry is judged against the supplied reference time"""
+        validator = ServerValidator()
+        checked = datetime.now(timezone.utc)
+        cache_entry = {"last_checked": checked.isoformat()}
+
+        assert validator._is_cache_valid(cache_entry, checked + timedelta(hours=1)) == True
+        assert validator._is_cache_valid(cache_entry, checked + timedelta(hours=25)) == False
+
+    def test_last_checked_parsed_once(self, temp_cache_dir):
+        """Test repeated lookups reuse the parsed timestamp"""
+        validator = ServerValidator()
+        cache_entry = {"last_checked": datetime.now(timezone.utc).isoformat()}
+
+        with patch("core.server_validator.datetime", wraps=datetime) as mock_datetime:
+            for _ in range(3):
+                assert validator._is_cache_valid(cache_entry) == True
+
+        assert mock_datetime.fromisoformat.call_count == 1
+
 
 class TestNPMPackageCheck:
     """Test NPM package checking"""
@@ -216,38 +248,126 @@ class TestNPMPackageCheck:
         pass
 
 
+class TestRegistrySession:
+    """Test the shared aiohttp session"""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_until_closed(self, temp_cache_dir):
+        """Test one session serves every check on a loop"""
+        validator = ServerValidator()
+
+        session = await validator._get_session()
+        assert await validator._get_session() is session
+
+        await validator.close()
+        assert session.closed
+        assert validator._session is None
+
+    @pytest.mark.asyncio
+    async def test_session_from_other_loop_closed_on_replace(self, temp_cache_dir):
+        """Test a session left on a finished loop is closed when replaced"""
+        validator = ServerValidator()
+
+        # asyncio.run gives the first session its own loop, closed on return
+        stale = await asyncio.to_thread(asyncio.run, validator._get_session())
+
+        session = await validator._get_session()
+        try:
+            assert session is not stale
+            assert stale.closed
+        finally:
+            await validator.close()
+
+
+    @pytest.mark.asyncio
+    async def test_http_probe_uses_head(self, temp_cache_dir):
+        """Test the HTTP probe treats 4xx as reachable and 5xx as down"""
+        from aiohttp import web
+
+        seen_methods = []
+
+        async def handler(request):
+            seen_methods.append(request.method)
+            return web.Response(status=int(request.match_info["status"]))
+
+        app = web.Application()
+        app.router.add_route("*", "/{status}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        validator = ServerValidator()
+        try:
+            assert await validator.check_http_endpoint(f"http://127.0.0.1:{port}/405") == (True, None)
+            reachable, error = await validator.check_http_endpoint(f"http://127.0.0.1:{port}/503")
+            assert reachable == False
+            assert "503" in error
+        finally:
+            await validator.close()
+            await runner.cleanup()
+
+        assert seen_methods == ["HEAD", "HEAD"]
+
+
+def mock_npm_list(dependencies, returncode=0):
+    """Build a fake `npm list` process for asyncio.create_subprocess_exec"""
+    proc = Mock()
+    proc.returncode = returncode
+    proc.communicate = AsyncMock(
+        return_value=(json.dumps({"dependencies": dependencies}).encode(), b"")
+    )
+    return AsyncMock(return_value=proc)
+
+
 class TestLocalInstallationCheck:
     """Test local installation checking"""
 
-    def test_check_local_installed(self, temp_cache_dir):
+    @pytest.mark.asyncio
+    async def test_check_local_installed(self, temp_cache_dir):
         """Test checking locally installed package"""
         validator = ServerValidator()
 
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps({
-            "dependencies": {
-                "test-package": {"version": "2.0.0"}
-            }
-        })
-
-        with patch("subprocess.run", return_value=mock_result):
-            installed, version = validator.check_local_installation("test-package")
-            assert installed == True
-            assert version == "2.0.0"
+        with patch("shutil.which", return_value="npm"):
+            with patch(
+                "asyncio.create_subprocess_exec",
+                mock_npm_list({"test-package": {"version": "2.0.0"}})
+            ):
+                installed, version = await validator.check_local_installation("test-package")
+                assert installed == True
+                assert version == "2.0.0"
 
-    def test_check_local_not_installed(self, temp_cache_dir):
+    @pytest.mark.asyncio
+    async def test_check_local_not_installed(self, temp_cache_dir):
         """Test checking package not installed locally"""
         validator = ServerValidator()
 
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stdout = json.dumps({"dependencies": {}})
+        with patch("shutil.which", return_value="npm"):
+            with patch("asyncio.create_subprocess_exec", mock_npm_list({}, returncode=1)):
+                installed, version = await validator.check_local_installation("test-package")
+                assert installed == False
+                assert version is None
 
-        with patch("subprocess.run", return_value=mock_result):
-            installed, version = validator.check_local_installation("test-package")
-            assert installed == False
-            assert version is None
+    @pytest.mark.asyncio
+    async def test_global_packages_scanned_once(self, temp_cache_dir):
+        """Test one npm list call answers checks for every package"""
+        validator = ServerValidator()
+        spawn = mock_npm_list({
+            "pkg-a": {"version": "1.0.0"},
+            "pkg-b": {"version": "2.0.0"}
+        })
+
+        with patch("shutil.which", return_value="npm"):
+            with patch("asyncio.create_subprocess_exec", spawn):
+                results = await asyncio.gather(
+                    validator.check_local_installation("pkg-a"),
+                    validator.check_local_installation("pkg-b"),
+                    validator.check_local_installation("pkg-c")
+                )
+
+        assert results == [(True, "1.0.0"), (True, "2.0.0"), (False, None)]
+        assert spawn.call_count == 1
 
 
 class TestValidateServer:
@@ -296,10 +416,40 @@ class TestValidateServer:
     async def test_validate_http_server(self, temp_cache_dir, http_server):
         """Test HTTP server validation"""
         validator = ServerValidator()
-        result = await validator.validate_server(http_server)
+        with patch.object(validator, "check_http_endpoint", return_value=(True, None)) as mock_probe:
+            result = await validator.validate_server(http_server)
 
+        mock_probe.assert_called_once_with(http_server.url)
         assert result.validation is not None
-        assert result.validation.npm_available == True  # Used to indicate "valid"
+        assert result.validation.endpoint_reachable == True
+        assert result.validation.npm_available is None
+
+    @pytest.mark.asyncio
+    async def test_validate_unreachable_http_server(self, temp_cache_dir, http_server):
+        """Test an unreachable HTTP server is flagged and cached"""
+        validator = ServerValidator()
+        with patch.object(validator, "check_http_endpoint", return_value=(False, "Server returned status 503")):
+            result = await validator.validate_server(http_server)
+
+        assert result.validation.endpoint_reachable == False
+        assert result.validation.npm_available is None
+        assert result.validation.error_message == "Server returned status 503"
+        assert validator.cache[f"http:{http_server.url}"]["endpoint_reachable"] == False
+
+    @pytest.mark.asyncio
+    async def test_validate_after_corrupt_cache(self, temp_cache_dir, http_server):
+        """Test validation still caches results after a corrupt cache file is discarded"""
+        cache_file = temp_cache_dir / "cc-validation-cache.json"
+        cache_file.write_text("{not json", encoding="utf-8")
+
+        validator = ServerValidator()
+        assert validator.cache == {}
+
+        with patch.object(validator, "check_http_endpoint", return_value=(True, None)):
+            result = await validator.validate_server(http_server)
+
+        assert result.validation.endpoint_reachable == True
+        assert f"http:{http_server.url}" in validator.cache
 
 
 class TestValidateAllServers:
@@ -316,7 +466,7 @@ class TestValidateAllServers:
 
         with patch.object(validator, "validate_server") as mock_validate:
             # Mock returns the same server with validation
-            async def mock_validate_fn(server, force_refresh=False):
+            async def mock_validate_fn(server, force_refresh=False, now=None):
                 server.validation = ValidationStatus(npm_available=True)
                 return server
 
@@ -328,6 +478,108 @@ class TestValidateAllServers:
             assert stdio_server.id in result
             assert http_server.id in result
             assert mock_validate.call_count == 2
+            assert result[stdio_server.id].validation.npm_available is True
+
+    @pytest.mark.asyncio
+    async def test_all_cached_skips_validation_tasks(self, temp_cache_dir, stdio_server, http_server):
+        """Test a fully cached batch is answered without validating or saving"""
+        validator = ServerValidator()
+        servers = {stdio_server.id: stdio_server, http_server.id: http_server}
+        checked = datetime.now(timezone.utc).isoformat()
+        for server in servers.values():
+            validator.cache[validator._get_cache_key(server)] = {
+                "npm_available": True,
+                "last_checked": checked
+            }
+
+        with patch.object(validator, "validate_server") as mock_validate:
+            with patch.object(validator, "_save_cache") as mock_save:
+                result = await validator.validate_all_servers(servers)
+
+        mock_validate.assert_not_called()
+        mock_save.assert_not_called()
+        assert list(result) == [stdio_server.id, http_server.id]
+        assert all(server.validation.cached for server in result.values())
+
+    @pytest.mark.asyncio
+    async def test_on_result_reports_in_completion_order(self, temp_cache_dir, stdio_server, http_server):
+        """Test each server is reported as soon as it finishes"""
+        validator = ServerValidator()
+        servers = {stdio_server.id: stdio_server, http_server.id: http_server}
+        reported = []
+
+        async def mock_validate_fn(server, force_refresh=False, now=None):
+            if server.type == "stdio":
+                await asyncio.sleep(0.01)
+            return server
+
+        with patch.object(validator, "validate_server", side_effect=mock_validate_fn):
+            result = await validator.validate_all_servers(
+                servers, force_refresh=True, on_result=lambda server: reported.append(server.id)
+            )
+
+        assert reported == [http_server.id, stdio_server.id]
+        assert list(result) == [stdio_server.id, http_server.id]
+
+    @pytest.mark.asyncio
+    async def test_failed_servers_keep_their_ids(self, temp_cache_dir):
+        """Test every failing server falls back to its own original entry"""
+        validator = ServerValidator()
+        servers = {
+            f"http-{i}": MCPServer(id=f"http-{i}", type="http", url=f"https://api{i}.example.com/mcp")
+            for i in range(5)
+        }
+
+        with patch.object(validator, "validate_server", side_effect=RuntimeError("registry down")):
+            result = await validator.validate_all_servers(servers, force_refresh=True)
+
+        assert list(result) == list(servers)
+        assert all(result[server_id] is server for server_id, server in servers.items())
+
+    @pytest.mark.asyncio
+    async def test_shared_package_checked_once(self, temp_cache_dir, stdio_server):
+        """Test servers using the same package share one registry check"""
+        validator = ServerValidator()
+        twin = MCPServer(
+            id="twin-server",
+            type="stdio",
+            command="npx",
+            args=["-y", "@modelcontextprotocol/server-filesystem"]
+        )
+
+        async def slow_check(package_name):
+            await asyncio.sleep(0.01)
+            return True, "1.0.0", None
+
+        with patch.object(validator, "check_npm_package", side_effect=slow_check) as mock_npm:
+            with patch.object(validator, "check_local_installation", return_value=(False, None)):
+                result = await validator.validate_all_servers(
+                    {stdio_server.id: stdio_server, twin.id: twin},
+                    force_refresh=True
+                )
+
+        assert mock_npm.call_count == 1
+        assert result[twin.id].validation.npm_version == "1.0.0"
+        assert result[stdio_server.id].validation.npm_version == "1.0.0"
+
+
+    @pytest.mark.asyncio
+    async def test_cache_written_once_per_batch(self, temp_cache_dir, stdio_server, http_server):
+        """Test validating many servers saves the cache a single time"""
+        validator = ServerValidator()
+        servers = {stdio_server.id: stdio_server, http_server.id: http_server}
+
+        with patch.object(validator, "check_npm_package", return_value=(True, "1.0.0", None)), \
+                patch.object(validator, "check_local_installation", return_value=(False, None)), \
+                patch.object(validator, "check_http_endpoint", return_value=(True, None)):
+            with patch("utils.file_io.os.replace", wraps=os.replace) as mock_replace:
+                await validator.validate_all_servers(servers, force_refresh=True)
+
+        cache_file = temp_cache_dir / "cc-validation-cache.json"
+        cache_writes = [c for c in mock_replace.call_args_list if Path(c.args[1]) == cache_file]
+        assert len(cache_writes) == 1
+        cache = json.loads(cache_file.read_text())
+        assert len(cache) == 2
 
 
 class TestCacheManagement:
@@ -348,6 +600,44 @@ class TestCacheManagement:
         assert len(validator.cache) == 0
         assert not cache_file.exists()
 
+    @pytest.mark.asyncio
+    async def test_cache_evicts_least_recently_used(self, temp_cache_dir):
+        """Test the cache keeps at most MAX_CACHE_ENTRIES, dropping the stalest"""
+        validator = ServerValidator()
+        servers = [
+            MCPServer(id=f"http-{i}", type="http", url=f"https://api{i}.example.com/mcp")
+            for i in range(3)
+        ]
+
+        with patch("core.server_validator.MAX_CACHE_ENTRIES", 2), \
+                patch.object(validator, "check_http_endpoint", return_value=(True, None)):
+            await validator.validate_server(servers[0])
+            await validator.validate_server(servers[1])
+            # Cache hit makes http-0 the most recently used entry
+            await validator.validate_server(servers[0])
+            await validator.validate_server(servers[2])
+
+        assert list(validator.cache) == [
+            "http:https://api0.example.com/mcp",
+            "http:https://api2.example.com/mcp",
+        ]
+
+    def test_failed_save_keeps_previous_cache(self, temp_cache_dir):
+        """Test an interrupted save leaves the existing cache file intact"""
+        validator = ServerValidator()
+        cache_file = temp_cache_dir / "cc-validation-cache.json"
+
+        validator.cache = {"stdio:pkg": {"last_checked": "2025-01-01T00:00:00+00:00"}}
+        validator._save_cache()
+        original = cache_file.read_bytes()
+
+        validator.cache["stdio:other"] = {"last_checked": "2025-01-02T00:00:00+00:00"}
+        with patch("utils.file_io.os.fsync", side_effect=OSError("disk full")):
+            validator._save_cache()
+
+        assert cache_file.read_bytes() == original
+        assert not (temp_cache_dir / "cc-validation-cache.json.tmp").exists()
+
     def test_get_cache_key_stdio(self, temp_cache_dir, stdio_server):
         """Test cache key generation for stdio server"""
         validator = ServerValidator()
@@ -0,0 +1,91 @@
+"""Tests for system tray manager"""
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+# pystray picks a backend at import time; the dummy one needs no display
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+pytest.importorskip("pystray")
+
+from core.system_tray import SystemTrayManager
+
+
+@pytest.fixture
+def tk_root():
+    """Stand-in for the Tk main window"""
+    return MagicMock()
+
+
+@pytest.fixture
+def tray_manager(tk_root):
+    """Tray manager wired to a mock window"""
+    return SystemTrayManager(
+        tk_root=tk_root,
+        restore_callback=MagicMock(),
+        launch_callback=MagicMock(),
+        icon_path=Path("missing-icon.ico"),
+        get_recent_profiles_callback=MagicMock(return_value=[("dev", "Dev")]),
+        switch_profile_callback=MagicMock()
+    )
+
+
+class TestTrayStartup:
+    """Test starting the tray icon thread"""
+
+    def test_build_failure_reported_to_window(self, tray_manager, tk_root):
+        """Test an icon that fails to build is reported back on the Tk thread"""
+        with patch.object(tray_manager, "_is_tray_available", return_value=True):
+            assert tray_manager.create_tray_icon() == True
+            tray_manager.tray_thread.join(timeout=5)
+
+        assert tray_manager.icon is None
+        tk_root.after.assert_called_once_with(0, tk_root.show_tray_unavailable_message)
+
+    def test_minimize_without_icon_iconifies(self, tray_manager, tk_root):
+        """Test the window is iconified rather than hidden when there is no tray icon"""
+        tray_manager.minimize_to_tray()
+
+        tk_root.iconify.assert_called_once()
+        tk_root.withdraw.assert_not_called()
+
+    def test_minimize_with_icon_withdraws(self, tray_manager, tk_root):
+        """Test the window is hidden when the tray icon can restore it"""
+        tray_manager.icon = MagicMock()
+        tray_manager.minimize_to_tray()
+
+        tk_root.withdraw.assert_called_once()
+        tk_root.iconify.assert_not_called()
+
+
+class TestRecentProfilesMenu:
+    """Test the Recent Profiles submenu"""
+
+    def _recent_profiles_item(self, tray_manager):
+        with patch("core.system_tray._load_icon_image", return_value=Image.new("RGB", (16, 16))):
+            icon = tray_manager._build_icon()
+        return next(item for item in icon.menu.items if item.text == "Recent Profiles")
+
+    def test_recent_profiles_is_submenu(self, tray_manager):
+        """Test Recent Profiles opens a submenu listing the profiles"""
+        item = self._recent_profiles_item(tray_manager)
+
+        assert item.submenu is not None
+        assert [entry.text for entry in item.submenu.items] == ["Dev"]
+
+    def test_submenu_reused_until_invalidated(self, tray_manager):
+        """Test the profile list is only fetched again after invalidation"""
+        item = self._recent_profiles_item(tray_manager)
+        get_recent = tray_manager.get_recent_profiles_callback
+
+        list(item.submenu.items)
+        list(item.submenu.items)
+        assert get_recent.call_count == 1
+
+        get_recent.return_value = [("dev", "Dev"), ("prod", "Prod")]
+        tray_manager.invalidate_profile_menu()
+        assert [entry.text for entry in item.submenu.items] == ["Dev", "Prod"]
+        assert get_recent.call_count == 2
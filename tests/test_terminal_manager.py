@@ -2,16 +2,31 @@
 
 import pytest
 import json
+import os
 import subprocess
+import threading
+import time
 import psutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, mock_open
 from datetime import datetime
 
-from core.terminal_manager import TerminalManager, TerminalType
+from core.terminal_manager import TerminalManager, TerminalType, _platform_shells, _SUBPROCESS_KWARGS
 from models.server import MCPServer
 
 
+def platform_shells(platform):
+    """Patch terminal detection to behave as it does on ``platform``."""
+    candidates, fallback = _platform_shells(platform)
+    return patch.multiple(
+        "core.terminal_manager",
+        _IS_WINDOWS=platform == "win32",
+        _PLATFORM_SHELL_CANDIDATES=candidates,
+        _PLATFORM_FALLBACK_SHELL=fallback,
+    )
+
+
 # Fixtures
 
 @pytest.fixture
@@ -69,49 +84,91 @@ def temp_dir(tmp_path):
 class TestFindTerminal:
     """Tests for find_terminal()"""
 
+    @pytest.fixture(autouse=True)
+    def no_windows_apps_alias(self, tmp_path, monkeypatch):
+        """Point %LOCALAPPDATA% at an empty directory (no wt.exe alias)."""
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+        return tmp_path
+
+    @platform_shells('win32')
     @patch('subprocess.run')
-    def test_find_windows_terminal(self, mock_run, terminal_manager):
-        """Test Windows Terminal detection."""
-        mock_run.return_value = Mock(returncode=0, stdout="C:\\path\\to\\wt.exe")
+    @patch('shutil.which')
+    def test_find_windows_terminal(self, mock_which, mock_run, terminal_manager):
+        """Test Windows Terminal detection on PATH without spawning a process."""
+        mock_which.side_effect = lambda cmd: "C:\\path\\to\\wt.exe" if cmd == "wt.exe" else None
 
         result = terminal_manager.find_terminal()
 
         assert result == TerminalType.WINDOWS_TERMINAL
-        mock_run.assert_called_once()
+        assert terminal_manager.windows_terminal_path == "C:\\path\\to\\wt.exe"
+        mock_run.assert_not_called()
 
-    @patch('subprocess.run')
+    @platform_shells('win32')
     @patch('shutil.which')
-    def test_find_powershell_7(self, mock_which, mock_run, terminal_manager):
+    def test_find_windows_terminal_app_alias(self, mock_which, terminal_manager, no_windows_apps_alias):
+        """Test the WindowsApps execution alias is found before scanning PATH."""
+        alias = no_windows_apps_alias / "Microsoft" / "WindowsApps" / "wt.exe"
+        alias.parent.mkdir(parents=True)
+        alias.touch()
+
+        result = terminal_manager.find_terminal()
+
+        assert result == TerminalType.WINDOWS_TERMINAL
+        assert terminal_manager.windows_terminal_path == str(alias)
+        mock_which.assert_not_called()
+
+    @platform_shells('win32')
+    @patch('shutil.which')
+    def test_find_powershell_7(self, mock_which, terminal_manager):
         """Test PowerShell 7 detection when Windows Terminal not available."""
-        mock_run.return_value = Mock(returncode=1)  # wt not found
         mock_which.side_effect = lambda cmd: "C:\\path\\pwsh.exe" if cmd == "pwsh" else None
 
         result = terminal_manager.find_terminal()
 
         assert result == TerminalType.POWERSHELL_7
 
-    @patch('subprocess.run')
+    @platform_shells('win32')
     @patch('shutil.which')
-    def test_find_powershell_5(self, mock_which, mock_run, terminal_manager):
+    def test_find_powershell_5(self, mock_which, terminal_manager):
         """Test PowerShell 5 detection when wt and pwsh not available."""
-        mock_run.return_value = Mock(returncode=1)
         mock_which.side_effect = lambda cmd: "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe" if cmd == "powershell" else None
 
         result = terminal_manager.find_terminal()
 
         assert result == TerminalType.POWERSHELL_5
 
-    @patch('subprocess.run')
+    @platform_shells('win32')
     @patch('shutil.which')
-    def test_find_cmd_fallback(self, mock_which, mock_run, terminal_manager):
+    def test_find_cmd_fallback(self, mock_which, terminal_manager):
         """Test CMD fallback when no other terminal found."""
-        mock_run.return_value = Mock(returncode=1)
         mock_which.return_value = None
 
         result = terminal_manager.find_terminal()
 
         assert result == TerminalType.CMD
 
+    @platform_shells('linux')
+    @patch('shutil.which')
+    def test_detection_cached(self, mock_which, terminal_manager):
+        """Test repeated lookups reuse the first detection."""
+        mock_which.side_effect = lambda cmd: None if cmd == "bash" else f"/usr/bin/{cmd}"
+
+        assert terminal_manager.find_terminal() == TerminalType.ZSH
+        assert terminal_manager.find_terminal() == TerminalType.ZSH
+
+        # bash miss and zsh hit, each looked up once
+        assert mock_which.call_count == 2
+
+    def test_detection_cached_per_force_powershell(self, terminal_manager):
+        """Test toggling force_powershell back and forth detects each mode once."""
+        with patch.object(terminal_manager, '_detect_terminal',
+                          side_effect=lambda force: "ps" if force else "wt") as detect:
+            for _ in range(2):
+                assert terminal_manager.find_terminal(force_powershell=False) == "wt"
+                assert terminal_manager.find_terminal(force_powershell=True) == "ps"
+
+        assert detect.call_count == 2
+
 
 class TestCheckPowerShellVersion:
     """Tests for check_powershell_version()"""
@@ -124,25 +181,64 @@ class TestCheckPowerShellVersion:
         result = terminal_manager.check_powershell_version()
 
         assert result == "7.5.3"
-        mock_run.assert_called_once_with(
+        mock_run.assert_any_call(
             ["pwsh", "-Command", "$PSVersionTable.PSVersion.ToString()"],
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=5
+            timeout=2,
+            **_SUBPROCESS_KWARGS
         )
 
     @patch('subprocess.run')
     def test_check_powershell_5_version(self, mock_run, terminal_manager):
         """Test PowerShell 5 version detection when pwsh not available."""
-        # First call (pwsh) fails, second call (powershell) succeeds
-        mock_run.side_effect = [
-            FileNotFoundError(),
-            Mock(returncode=0, stdout="5.1.19041.4648\n")
-        ]
+        def run(cmd, **kwargs):
+            if cmd[0] == "pwsh":
+                raise FileNotFoundError()
+            return Mock(returncode=0, stdout="5.1.19041.4648\n")
+
+        mock_run.side_effect = run
+
+        result = terminal_manager.check_powershell_version()
+
+        assert result == "5.1.19041.4648"
+
+    @patch('subprocess.run')
+    def test_check_powershell_7_preferred(self, mock_run, terminal_manager):
+        """Test PowerShell 7 wins even when PowerShell 5 answers first."""
+        pwsh_started = threading.Event()
+
+        def run(cmd, **kwargs):
+            if cmd[0] == "pwsh":
+                pwsh_started.set()
+                time.sleep(0.05)
+                return Mock(returncode=0, stdout="7.5.3\n")
+            pwsh_started.wait(1)
+            return Mock(returncode=0, stdout="5.1.19041.4648\n")
+
+        mock_run.side_effect = run
 
         result = terminal_manager.check_powershell_version()
 
+        assert result == "7.5.3"
+
+    @patch('subprocess.run')
+    def test_check_powershell_timeout_falls_back(self, mock_run, terminal_manager, caplog):
+        """Test a hung pwsh is logged and PowerShell 5 is used instead."""
+        def run(cmd, **kwargs):
+            if cmd[0] == "pwsh":
+                raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+            return Mock(returncode=0, stdout="5.1.19041.4648\n")
+
+        mock_run.side_effect = run
+
+        with caplog.at_level("WARNING", logger="core.terminal_manager"):
+            result = terminal_manager.check_powershell_version()
+
         assert result == "5.1.19041.4648"
+        assert "pwsh did not report its version" in caplog.text
 
     @patch('subprocess.run')
     def test_check_powershell_version_unavailable(self, mock_run, terminal_manager):
@@ -159,35 +255,52 @@ class TestCheckPowerShellVersion:
 class TestCheckClaudeCodeRunning:
     """Tests for check_claude_code_running()"""
 
+    @pytest.fixture(autouse=True)
+    def use_psutil_scan(self):
+        """Exercise the psutil scan regardless of the host OS."""
+        with patch('core.terminal_manager._USE_PROCFS', False):
+            yield
+
     @patch('psutil.process_iter')
     def test_claude_code_found(self, mock_process_iter, terminal_manager):
         """Test Claude Code process detection."""
         mock_proc = Mock()
-        mock_proc.info = {
-            'pid': 12345,
-            'name': 'node.exe',
-            'cmdline': ['node', 'C:\\path\\to\\claude.exe', '--mcp-config', 'config.json']
-        }
+        mock_proc.info = {'pid': 12345, 'name': 'node.exe'}
+        mock_proc.cmdline.return_value = ['node', 'C:\\path\\to\\claude.exe', '--mcp-config', 'config.json']
         mock_process_iter.return_value = [mock_proc]
 
         result = terminal_manager.check_claude_code_running()
 
         assert result == 12345
+        mock_process_iter.assert_called_once_with(['pid', 'name'])
 
     @patch('psutil.process_iter')
     def test_claude_code_not_found(self, mock_process_iter, terminal_manager):
         """Test when Claude Code is not running."""
         mock_proc = Mock()
-        mock_proc.info = {
-            'pid': 67890,
-            'name': 'chrome.exe',
-            'cmdline': ['chrome', '--some-flag']
-        }
+        mock_proc.info = {'pid': 67890, 'name': 'chrome.exe'}
         mock_process_iter.return_value = [mock_proc]
 
         result = terminal_manager.check_claude_code_running()
 
         assert result is None
+        # Non-candidate processes never have their cmdline read
+        mock_proc.cmdline.assert_not_called()
+
+    @patch('psutil.process_iter')
+    def test_cmdline_access_denied_skipped(self, mock_process_iter, terminal_manager):
+        """Test a candidate whose cmdline cannot be read is skipped."""
+        denied = Mock()
+        denied.info = {'pid': 1, 'name': 'node'}
+        denied.cmdline.side_effect = psutil.AccessDenied()
+        claude = Mock()
+        claude.info = {'pid': 2, 'name': 'claude'}
+        claude.cmdline.return_value = ['claude']
+        mock_process_iter.return_value = [denied, claude]
+
+        result = terminal_manager.check_claude_code_running()
+
+        assert result == 2
 
     @patch('psutil.process_iter')
     def test_access_denied_handled(self, mock_process_iter, terminal_manager):
@@ -207,6 +320,63 @@ class TestCheckClaudeCodeRunning:
         assert result is None
 
 
+class TestProcfsScan:
+    """Tests for the Linux /proc scan used by check_claude_code_running()"""
+
+    @staticmethod
+    def make_proc(root, pid, comm, cmdline):
+        proc_dir = root / str(pid)
+        proc_dir.mkdir()
+        (proc_dir / "comm").write_text(comm + "\n")
+        (proc_dir / "cmdline").write_bytes("\x00".join(cmdline).encode() + b"\x00")
+
+    @pytest.fixture
+    def proc_root(self, tmp_path):
+        with patch('core.terminal_manager._USE_PROCFS', True), \
+                patch('core.terminal_manager._PROC_ROOT', str(tmp_path)):
+            yield tmp_path
+
+    def test_claude_found(self, terminal_manager, proc_root):
+        """Test a node process running the Claude CLI is found."""
+        self.make_proc(proc_root, 10, "bash", ["bash", "-c", "claude"])
+        self.make_proc(proc_root, 20, "node", ["node", "/usr/lib/node_modules/@anthropic-ai/claude-code/cli.js"])
+        (proc_root / "self").mkdir()
+
+        assert terminal_manager.check_claude_code_running() == 20
+
+    def test_non_candidate_cmdline_not_read(self, terminal_manager, proc_root):
+        """Test only processes named node/claude have their cmdline read."""
+        self.make_proc(proc_root, 30, "python3", ["claude"])
+
+        assert terminal_manager.check_claude_code_running() is None
+
+    def test_vanished_process_skipped(self, terminal_manager, proc_root):
+        """Test a PID directory without readable files is skipped."""
+        (proc_root / "40").mkdir()
+        self.make_proc(proc_root, 50, "claude", ["claude"])
+
+        assert terminal_manager.check_claude_code_running() == 50
+
+    def test_known_pid_rechecked_without_scan(self, terminal_manager, proc_root):
+        """Test a previously found PID is re-verified instead of rescanning /proc."""
+        self.make_proc(proc_root, 60, "claude", ["claude"])
+        assert terminal_manager.check_claude_code_running() == 60
+
+        with patch.object(terminal_manager, '_find_claude_pid_procfs') as scan:
+            assert terminal_manager.check_claude_code_running() == 60
+        scan.assert_not_called()
+
+    def test_reused_pid_triggers_rescan(self, terminal_manager, proc_root):
+        """Test a known PID that no longer runs Claude falls back to a full scan."""
+        self.make_proc(proc_root, 70, "claude", ["claude"])
+        assert terminal_manager.check_claude_code_running() == 70
+
+        (proc_root / "70" / "cmdline").write_bytes(b"vim\x00")
+        self.make_proc(proc_root, 80, "node", ["node", "claude-code"])
+
+        assert terminal_manager.check_claude_code_running() == 80
+
+
 class TestKillClaudeCode:
     """Tests for kill_claude_code()"""
 
@@ -325,11 +495,98 @@ class TestGenerateMCPConfig:
         assert 'filesystem' in config['mcpServers']
         assert 'api' in config['mcpServers']
 
+    def test_generate_unchanged_config_not_rewritten(self, terminal_manager, sample_servers, temp_dir):
+        """Test regenerating an identical config reuses the existing file."""
+        project_path = str(temp_dir)
+        config_path = terminal_manager.generate_mcp_config(sample_servers, project_path)
+
+        with patch('core.terminal_manager.os.replace') as mock_replace:
+            assert terminal_manager.generate_mcp_config(sample_servers, project_path) == config_path
+        mock_replace.assert_not_called()
+
+        sample_servers["ref"].args.append("--verbose")
+        assert terminal_manager.generate_mcp_config(sample_servers, project_path) == config_path
+        config = json.loads(config_path.read_text())
+        assert config['mcpServers']['ref']['args'][-1] == "--verbose"
+        assert not config_path.with_suffix(".json.tmp").exists()
+
+        terminal_manager.cleanup_temp_config()
+
+    def test_generate_writes_compact_utf8(self, terminal_manager, sample_servers, temp_dir):
+        """Test the config is written without indentation and non-ASCII unescaped."""
+        sample_servers["ref"].args.append("--name=café")
+
+        config_path = terminal_manager.generate_mcp_config(sample_servers, str(temp_dir))
+
+        raw = config_path.read_bytes()
+        assert b"\n" not in raw
+        assert "café".encode("utf-8") in raw
+
+        terminal_manager.cleanup_temp_config()
+
+    def test_generate_reuses_per_process_path(self, terminal_manager, sample_servers, temp_dir):
+        """Test the config file name is fixed per process and reused after cleanup."""
+        config_path = terminal_manager.generate_mcp_config(sample_servers, str(temp_dir))
+        assert config_path.name == f"cc-mcp-{os.getpid()}.json"
+
+        terminal_manager.cleanup_temp_config()
+        assert terminal_manager.generate_mcp_config(sample_servers, str(temp_dir)) == config_path
+
+        terminal_manager.cleanup_temp_config()
+
+    def test_generate_rewrites_after_other_instance(self, terminal_manager, sample_servers, temp_dir):
+        """Test a second manager writing the shared path does not leave stale servers behind."""
+        other = TerminalManager()
+        only_ref = {"ref": sample_servers["ref"]}
+
+        config_path = terminal_manager.generate_mcp_config(sample_servers, str(temp_dir))
+        assert other.generate_mcp_config(only_ref, str(temp_dir)) == config_path
+        terminal_manager.generate_mcp_config(sample_servers, str(temp_dir))
+
+        config = json.loads(config_path.read_text())
+        assert set(config['mcpServers']) == {"filesystem", "ref"}
+
+        terminal_manager.cleanup_temp_config()
+
+    def test_unchanged_config_mtime_refreshed(self, terminal_manager, sample_servers, temp_dir):
+        """Test reusing an unchanged config keeps it clear of the stale-file sweep."""
+        config_path = terminal_manager.generate_mcp_config(sample_servers, str(temp_dir))
+        two_days_ago = time.time() - 2 * 24 * 60 * 60
+        os.utime(config_path, (two_days_ago, two_days_ago))
+
+        terminal_manager.generate_mcp_config(sample_servers, str(temp_dir))
+
+        assert config_path.stat().st_mtime > two_days_ago + 60
+        terminal_manager.cleanup_temp_config()
+
+    def test_exit_cleanup_does_not_keep_manager_alive(self, sample_servers, temp_dir):
+        """Test the exit cleanup hook holds managers weakly."""
+        import gc
+        import weakref
+
+        manager = TerminalManager()
+        manager.generate_mcp_config(sample_servers, str(temp_dir))
+        manager.cleanup_temp_config()
+        ref = weakref.ref(manager)
+
+        del manager
+        gc.collect()
+
+        assert ref() is None
+
     def test_generate_no_servers_error(self, terminal_manager, temp_dir):
         """Test error when no servers provided."""
         with pytest.raises(ValueError, match="No servers provided"):
             terminal_manager.generate_mcp_config({}, str(temp_dir))
 
+    def test_generate_all_disabled_error(self, terminal_manager, sample_servers, temp_dir):
+        """Test error when every server is disabled."""
+        for server in sample_servers.values():
+            server.enabled = False
+
+        with pytest.raises(ValueError, match="No enabled servers"):
+            terminal_manager.generate_mcp_config(sample_servers, str(temp_dir))
+
     def test_generate_env_var_expansion(self, terminal_manager, temp_dir):
         """Test environment variable expansion in args."""
         server = MCPServer(
@@ -350,10 +607,28 @@ class TestGenerateMCPConfig:
         # %CD% should be replaced with project_path
         assert project_path in config['mcpServers']['test']['args']
 
+    def test_generate_literal_args_skip_expansion(self, terminal_manager, temp_dir):
+        """Test args without $ or % are passed through without expansion."""
+        server = MCPServer(
+            id="test",
+            type="stdio",
+            command="npx",
+            args=["-y", "test-server"],
+            enabled=True
+        )
+
+        with patch('core.terminal_manager.expand_env_vars_in_list') as mock_expand:
+            config_path = terminal_manager.generate_mcp_config({"test": server}, str(temp_dir))
+
+        mock_expand.assert_not_called()
+        config = json.loads(config_path.read_text())
+        assert config['mcpServers']['test']['args'] == ["-y", "test-server"]
+
 
 class TestGetLaunchCommand:
     """Tests for get_launch_command()."""
 
+    @platform_shells('win32')
     def test_get_launch_command_success(self, terminal_manager, sample_servers, temp_dir):
         """Command generation returns PowerShell script lines."""
         project_path = str(temp_dir)
@@ -372,6 +647,29 @@ class TestGetLaunchCommand:
 
         terminal_manager.cleanup_temp_config()
 
+    def test_terminal_detected_alongside_config(self, terminal_manager, sample_servers, temp_dir):
+        """Uncached terminal detection runs on the executor, not the caller thread."""
+        detect_threads = []
+
+        def detect(force_powershell=False):
+            detect_threads.append(threading.current_thread())
+            return TerminalType.BASH
+
+        with ThreadPoolExecutor(max_workers=1) as executor, \
+                patch.object(terminal_manager, '_detect_terminal', side_effect=detect):
+            success, command = terminal_manager.get_launch_command(
+                sample_servers, str(temp_dir), executor=executor
+            )
+            # Cached now, so the second call stays on the caller thread
+            terminal_manager.get_launch_command(sample_servers, str(temp_dir), executor=executor)
+
+        assert success is True
+        assert command.startswith('cd "')
+        assert len(detect_threads) == 1
+        assert detect_threads[0] is not threading.current_thread()
+
+        terminal_manager.cleanup_temp_config()
+
     def test_get_launch_command_requires_enabled_servers(self, terminal_manager, sample_servers, temp_dir):
         """At least one enabled server is required."""
         for server in sample_servers.values():
@@ -406,6 +704,24 @@ class TestCleanupTempConfig:
         assert not config_path.exists()
         assert terminal_manager.temp_config_path is None
 
+    def test_stale_configs_removed_on_startup(self, tmp_path):
+        """Test leftover configs older than a day are deleted, recent ones kept."""
+        stale = tmp_path / "cc-mcp-111.json"
+        recent = tmp_path / "cc-mcp-222.json"
+        unrelated = tmp_path / "other.json"
+        for path in (stale, recent, unrelated):
+            path.write_text("{}")
+        two_days_ago = time.time() - 2 * 24 * 60 * 60
+        os.utime(stale, (two_days_ago, two_days_ago))
+        os.utime(unrelated, (two_days_ago, two_days_ago))
+
+        with patch('tempfile.gettempdir', return_value=str(tmp_path)):
+            TerminalManager()
+
+        assert not stale.exists()
+        assert recent.exists()
+        assert unrelated.exists()
+
     def test_cleanup_no_config(self, terminal_manager):
         """Test cleanup when no temp config exists."""
         terminal_manager.temp_config_path = None
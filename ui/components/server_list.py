@@ -158,6 +158,9 @@ class ServerList(ttk.Frame):
         if validation.npm_available is False:
             return "❌ Package not found"
 
+        if validation.endpoint_reachable is False:
+            return "❌ Endpoint unreachable"
+
         if validation.cached:
             base = "🟡 Cached"
         else:
@@ -242,6 +242,8 @@ class MainWindow(ttk.Window):
         self.global_profiles = self.profile_manager_core.list_profiles()
         combined_profiles = self.profile_manager_core.get_all_profiles(project_path)
         self.profiles = combined_profiles
+        if self.tray_manager:
+            self.tray_manager.invalidate_profile_menu()
 
         if not hasattr(self, "profile_manager"):
             return
@@ -624,6 +626,7 @@ class MainWindow(ttk.Window):
                 logger.error("Error validating server '%s': %s", server_id, exc)
                 error_message = str(exc)
             finally:
+                loop.run_until_complete(self.server_validator.close())
                 loop.close()
 
             def finish():
@@ -659,6 +662,10 @@ class MainWindow(ttk.Window):
             except Exception:
                 pass
 
+        def show_progress(server):
+            # Called on the worker thread as each server finishes
+            self.after(0, self.server_list.update_server, server.id, server)
+
         def worker():
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
@@ -668,13 +675,15 @@ class MainWindow(ttk.Window):
                 validated_servers = loop.run_until_complete(
                     self.server_validator.validate_all_servers(
                         {sid: server for sid, server in self.servers.items()},
-                        force_refresh=True
+                        force_refresh=True,
+                        on_result=show_progress
                     )
                 )
             except Exception as exc:
                 logger.error("Error validating servers: %s", exc)
                 error_message = str(exc)
             finally:
+                loop.run_until_complete(self.server_validator.close())
                 loop.close()
 
             def finish():
@@ -0,0 +1,43 @@
+"""File writing helpers for Claude Code MCP Manager."""
+
+import os
+from typing import Optional, Union
+
+PathLike = Union[str, os.PathLike]
+
+
+def atomic_write_bytes(path: PathLike, data: bytes, temp_path: Optional[PathLike] = None) -> None:
+    """
+    Replace ``path`` with ``data`` so readers never see a partial file.
+
+    Writes to a temp file with one unbuffered write (looping only on short
+    writes), fsyncs it and renames it over ``path``. The temp file is removed
+    if any step fails.
+
+    Args:
+        path: File to replace
+        data: Bytes to write
+        temp_path: Temp file to write first; defaults to ``path`` + ".tmp"
+    """
+    path = os.fspath(path)
+    temp_path = os.fspath(temp_path) if temp_path is not None else path + ".tmp"
+    payload = memoryview(data)
+
+    try:
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload):]
+            # Data must be on disk before the rename, or a crash can leave
+            # an empty file behind
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,68 @@
+"""JSON encoding helpers for Claude Code MCP Manager.
+
+Prefers the ``orjson`` C extension, then ``ujson``, and falls back to the
+standard library when neither is installed. All backends share the same
+bytes-in/bytes-out interface so callers can read and write files in binary
+mode without an extra decode/encode pass.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - depends on environment
+    ujson = None
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def loads(data: bytes) -> Any:
+        """Parse JSON from UTF-8 bytes (or str)."""
+        return orjson.loads(data)
+
+    def dumps(obj: Any, *, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        """Serialize ``obj`` to UTF-8 encoded JSON bytes."""
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=default, option=option)
+
+elif ujson is not None:  # pragma: no cover - depends on environment
+    BACKEND = "ujson"
+    JSONDecodeError = ujson.JSONDecodeError
+
+    def loads(data: bytes) -> Any:
+        """Parse JSON from UTF-8 bytes (or str)."""
+        return ujson.loads(data)
+
+    def dumps(obj: Any, *, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        """Serialize ``obj`` to UTF-8 encoded JSON bytes."""
+        return ujson.dumps(
+            obj,
+            indent=2 if indent else 0,
+            ensure_ascii=False,
+            default=default
+        ).encode("utf-8")
+
+else:  # pragma: no cover - depends on environment
+    BACKEND = "json"
+    JSONDecodeError = json.JSONDecodeError
+
+    def loads(data: bytes) -> Any:
+        """Parse JSON from UTF-8 bytes (or str)."""
+        return json.loads(data)
+
+    def dumps(obj: Any, *, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        """Serialize ``obj`` to UTF-8 encoded JSON bytes."""
+        return json.dumps(
+            obj,
+            indent=2 if indent else None,
+            ensure_ascii=False,
+            default=default
+        ).encode("utf-8")